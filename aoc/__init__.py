@@ -0,0 +1,7 @@
+"""
+aoc
+
+Tooling around the solutions in src/: a single entry point for running, verifying,
+benchmarking and comparing the day modules, and for serving them from a warm process.
+See `python -m aoc --help`.
+"""
@@ -0,0 +1,100 @@
+"""
+answers.py
+
+A SQLite store of solved answers, keyed by (day, part, input digest, code digest).
+
+The code digest is the day module's source digest (see days.source_digest), so editing
+src/dayNN.py, or a src/ helper it uses, means its old answers are never hit again; they
+are deleted the next time that day stores an answer. The database runs in WAL mode with
+a generous busy timeout so the batch runner's worker processes can all write to it.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from aoc.parse_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_DB = DEFAULT_CACHE_DIR / "answers.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    input_digest TEXT NOT NULL,
+    code_digest TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    solve_seconds REAL,
+    created REAL NOT NULL,
+    PRIMARY KEY (day, part, input_digest, code_digest)
+)
+"""
+
+
+def plain(value: Any) -> Any:
+    """json.dumps default for answers: a numpy scalar (day09 answers with np.int64)
+    becomes the python number it holds. Anything else still can't be encoded."""
+    if getattr(value, "shape", None) == () and callable(getattr(value, "item", None)):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class AnswerStore:
+    def __init__(self, path: Path = DEFAULT_DB, timeout: float = 30.0):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(SCHEMA)
+
+    def get(
+        self, day: int, part: int, input_digest: str, code_digest: str
+    ) -> tuple[bool, Any]:
+        """Return (hit, answer)."""
+        row = self.connection.execute(
+            "SELECT answer FROM answers"
+            " WHERE day = ? AND part = ? AND input_digest = ? AND code_digest = ?",
+            (day, part, input_digest, code_digest),
+        ).fetchone()
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+
+    def put(
+        self,
+        day: int,
+        part: int,
+        input_digest: str,
+        code_digest: str,
+        answer: Any,
+        solve_seconds: float | None = None,
+    ) -> bool:
+        """Store <answer>, returning False if it isn't JSON-serialisable (and so isn't
+        stored). Answers from older versions of the day's code are dropped."""
+        try:
+            encoded = json.dumps(answer, default=plain)
+        except TypeError:
+            return False
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute(
+                "DELETE FROM answers WHERE day = ? AND code_digest != ?",
+                (day, code_digest),
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    day,
+                    part,
+                    input_digest,
+                    code_digest,
+                    encoded,
+                    solve_seconds,
+                    time.time(),
+                ),
+            )
+        return True
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,135 @@
+"""
+batch.py
+
+Solve every (day, part, input file) combination on a process pool.
+
+Input files for a day are inputs/dayNN*.txt plus anything in an inputs/dayNN/ directory,
+for each inputs directory given. Every job parses its own input, so a bad file or a
+crashing solver only fails the jobs that touch it.
+"""
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from aoc.answers import AnswerStore
+from aoc.days import INPUTS_DIR, get_solver, load_day, module_name, source_digest
+from aoc.parse_cache import ParseCache, input_digest
+
+
+@dataclass(frozen=True)
+class Job:
+    day: int
+    part: int
+    input_path: Path
+
+
+@dataclass
+class JobResult:
+    job: Job
+    answer: object = None
+    parse_seconds: float | None = None
+    solve_seconds: float | None = None
+    error: str | None = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def discover_inputs(day: int, input_dirs: list[Path]) -> list[Path]:
+    name = module_name(day)
+    paths = []
+    for input_dir in input_dirs:
+        paths += sorted(input_dir.glob(f"{name}*.txt"))
+        if (input_dir / name).is_dir():
+            paths += sorted((input_dir / name).glob("*.txt"))
+    return paths
+
+
+def build_jobs(
+    days: list[int], parts: list[int], input_dirs: list[Path] | None = None
+) -> list[Job]:
+    input_dirs = input_dirs or [INPUTS_DIR]
+    return [
+        Job(day, part, path)
+        for day in days
+        for path in discover_inputs(day, input_dirs)
+        for part in parts
+    ]
+
+
+def run_job(job: Job, use_cache: bool = True) -> JobResult:
+    result = JobResult(job)
+    try:
+        module = load_day(job.day)
+        input_str = job.input_path.read_text()
+        if use_cache:
+            answers = AnswerStore()
+            key = (job.day, job.part, input_digest(input_str), source_digest(module))
+            hit, result.answer = answers.get(*key)
+            if hit:
+                result.cached = True
+                return result
+
+        start = time.perf_counter()
+        if use_cache:
+            _, data = ParseCache().parse(module, input_str)
+        else:
+            data = module.parse_input(input_str)
+        result.parse_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result.answer = get_solver(module, job.part)(data)
+        result.solve_seconds = time.perf_counter() - start
+        if use_cache:
+            answers.put(*key, result.answer, result.solve_seconds)
+    except Exception as e:
+        result.error = "".join(traceback.format_exception_only(e)).strip()
+    return result
+
+
+def run_batch(
+    jobs: list[Job], workers: int | None = None, use_cache: bool = True
+) -> list[JobResult]:
+    """Fan <jobs> out over <workers> processes (default: one per core)."""
+    workers = workers or os.cpu_count() or 1
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job, use_cache): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:  # the worker itself died, e.g. BrokenProcessPool
+                results.append(JobResult(futures[future], error=repr(e)))
+
+    return sorted(
+        results, key=lambda r: (r.job.day, str(r.job.input_path), r.job.part)
+    )
+
+
+def format_ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.2f}"
+
+
+def format_results(results: list[JobResult]) -> str:
+    lines = [
+        f"{'day':>3} {'part':>4} {'input':<30} {'parse ms':>9} {'solve ms':>9}  answer"
+    ]
+    for result in results:
+        job = result.job
+        parse_ms, solve_ms = format_ms(result.parse_seconds), format_ms(result.solve_seconds)
+        if result.cached:
+            parse_ms = solve_ms = "cached"
+        answer = result.answer if result.ok else f"ERROR {result.error}"
+        lines.append(
+            f"{job.day:>3} {job.part:>4} {job.input_path.name:<30} "
+            f"{parse_ms:>9} {solve_ms:>9}  {answer}"
+        )
+    failed = sum(not result.ok for result in results)
+    lines.append(f"\n{len(results)} job(s), {failed} failed")
+    return "\n".join(lines)
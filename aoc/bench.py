@@ -0,0 +1,181 @@
+"""
+bench.py
+
+Time parse_input, part1 and part2 separately for each day over synthetic inputs at
+increasing scale, and fit how each phase grows with input size.
+
+The scaling exponent is the slope of log(time) against log(scale): ~1 is linear, ~2 is
+quadratic. A phase that would blow the time budget at the next scale (extrapolating with
+the exponent seen so far, and at least linearly) is skipped rather than run.
+"""
+
+import gc
+import math
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from types import ModuleType
+from typing import Any, Callable
+
+from aoc.days import get_solver, load_day
+from aoc.generators import generate
+from aoc.memory import measure
+
+PHASES = ("parse", "part1", "part2")
+
+
+@dataclass
+class Measurement:
+    day: int
+    phase: str
+    scale: float
+    input_bytes: int
+    samples: list[float] = field(default_factory=list)
+    skipped: bool = False
+    traced_peak_bytes: int | None = None
+
+    @property
+    def seconds(self) -> float | None:
+        return min(self.samples) if self.samples else None
+
+    @property
+    def ops_per_sec(self) -> float | None:
+        return 1 / self.seconds if self.seconds else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self) | {"seconds": self.seconds, "ops_per_sec": self.ops_per_sec}
+
+
+def clear_caches(module: ModuleType) -> None:
+    """Reset any functools caches so every sample starts cold (day11 leans on one)."""
+    for value in vars(module).values():
+        if callable(getattr(value, "cache_clear", None)):
+            value.cache_clear()
+
+
+def time_call(func: Callable, *args) -> tuple[float, Any]:
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def fit_exponent(points: list[tuple[float, float]]) -> float | None:
+    """Least-squares slope of log(seconds) against log(scale)."""
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def predicted_seconds(history: list[tuple[float, float]], scale: float) -> float:
+    last_scale, last_seconds = history[-1]
+    exponent = max(1.0, fit_exponent(history) or 1.0)
+    return last_seconds * (scale / last_scale) ** exponent
+
+
+def bench_day(
+    day: int,
+    scales: list[float],
+    repeat: int = 3,
+    budget: float = 10.0,
+    seed: int = 0,
+    track_memory: bool = False,
+    min_samples: int = 1,
+) -> list[Measurement]:
+    """Measure every phase of <day> at each scale. With <track_memory>, each phase gets
+    one extra (untimed) run under tracemalloc for its peak memory.
+
+    A phase stops sampling once its samples add up to more than <budget>, but not
+    before it has <min_samples> of them."""
+    module = load_day(day)
+    history: dict[str, list[tuple[float, float]]] = {phase: [] for phase in PHASES}
+    measurements = []
+
+    for scale in sorted(scales):
+        input_str = generate(day, scale, seed)
+        data = None
+        for phase in PHASES:
+            measurement = Measurement(day, phase, scale, len(input_str.encode()))
+            measurements.append(measurement)
+            if (phase != "parse" and data is None) or (
+                history[phase] and predicted_seconds(history[phase], scale) > budget
+            ):
+                measurement.skipped = True
+                continue
+            if phase == "parse":
+                func, args = module.parse_input, (input_str,)
+            else:
+                func, args = get_solver(module, int(phase[-1])), (data,)
+
+            for _ in range(repeat):
+                clear_caches(module)
+                elapsed, result = time_call(func, *args)
+                measurement.samples.append(elapsed)
+                if (
+                    len(measurement.samples) >= min_samples
+                    and sum(measurement.samples) > budget
+                ):
+                    break
+            if track_memory:
+                clear_caches(module)
+                _, memory = measure(phase, func, *args, top=0)
+                measurement.traced_peak_bytes = memory.traced_peak_bytes
+            if phase == "parse":
+                data = result
+            history[phase].append((scale, measurement.seconds))
+
+        if data is None:
+            break
+
+    return measurements
+
+
+def build_report(
+    measurements: list[Measurement], **settings: Any
+) -> dict[str, Any]:
+    """JSON-ready report; <settings> (scales, seed, ...) are recorded alongside."""
+    exponents = []
+    for day in sorted({m.day for m in measurements}):
+        for phase in PHASES:
+            points = [
+                (m.scale, m.seconds)
+                for m in measurements
+                if m.day == day and m.phase == phase and m.samples
+            ]
+            exponents.append(
+                {"day": day, "phase": phase, "exponent": fit_exponent(points)}
+            )
+    return {
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "settings": settings,
+        "results": [m.to_dict() for m in measurements],
+        "exponents": exponents,
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [f"{'day':>3} {'phase':<6} {'scale':>6} {'bytes':>10} {'seconds':>10} {'ops/s':>10}"]
+    for result in report["results"]:
+        if result["skipped"]:
+            timing = f"{'skipped':>10} {'':>10}"
+        else:
+            timing = f"{result['seconds']:>10.4f} {result['ops_per_sec']:>10.2f}"
+        lines.append(
+            f"{result['day']:>3} {result['phase']:<6} {result['scale']:>6g} "
+            f"{result['input_bytes']:>10} {timing}"
+        )
+    lines.append("")
+    for fitted in report["exponents"]:
+        if fitted["exponent"] is not None:
+            lines.append(
+                f"day {fitted['day']:02d} {fitted['phase']:<6} ~ n^{fitted['exponent']:.2f}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,391 @@
+"""
+cli.py
+
+Entry point for `python -m aoc`.
+
+    python -m aoc run 6                  # both parts of day 6 on inputs/day06.txt
+    python -m aoc run 6 --part 2 --input other.txt
+    python -m aoc run 6 --profile day06.json  # solver counters, timers, cache stats
+    python -m aoc run 9 --memory-budget 256M  # per-phase peak memory, failing over budget
+    python -m aoc verify                 # check the worked examples of every day
+    python -m aoc bench 4 6 --scales 1 10 100 --output bench.json
+    python -m aoc generate 9 --scale 10 > big_disk.txt
+    python -m aoc batch --inputs inputs/ more_inputs/ --workers 8
+    python -m aoc compare --save         # record a baseline, then after a change:
+    python -m aoc compare                # fails if anything got significantly slower
+    python -m aoc serve &                # keep solvers warm, then:
+    python -m aoc query 11 --part 2
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from aoc.days import available_days, default_input, get_solver, load_day
+
+
+def run(args: argparse.Namespace) -> int:
+    import instrument
+
+    from aoc.memory import (
+        MemoryBudgetExceeded,
+        check_budget,
+        format_memory,
+        measure,
+        parse_size,
+    )
+
+    try:
+        module = load_day(args.day)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    input_path = args.input or default_input(args.day)
+    if not Path(input_path).exists():
+        print(f"no input at {input_path}", file=sys.stderr)
+        return 1
+    parts = [args.part] if args.part else [1, 2]
+    if args.profile:
+        instrument.enable()
+    track_memory = args.memory or args.memory_budget is not None
+    budget = parse_size(args.memory_budget) if args.memory_budget else None
+
+    # measuring parse means running parse_input, not loading its cached result
+    if args.no_cache or args.profile or track_memory:
+        parse = module.parse_input
+    else:
+        from aoc.parse_cache import ParseCache
+
+        def parse(input_str):
+            return ParseCache().parse(module, input_str)[1]
+
+    # answers are only looked up when we aren't here to watch the solver run
+    use_answers = not (args.no_cache or args.profile or track_memory)
+    if use_answers:
+        from aoc.answers import AnswerStore
+        from aoc.days import source_digest
+        from aoc.parse_cache import input_digest
+
+    timings = {}
+    memories = []
+
+    def run_phase(phase, func, *func_args):
+        start = time.perf_counter()
+        with instrument.span(f"{module.__name__}.{phase}"):
+            if track_memory:
+                result, memory = measure(phase, func, *func_args, top=args.top)
+                memories.append(memory)
+            else:
+                result = func(*func_args)
+        timings[phase] = time.perf_counter() - start
+        if track_memory:
+            check_budget(memory, budget)
+        return result
+
+    input_str = Path(input_path).read_text()
+    if use_answers:
+        answers = AnswerStore()
+        key = (input_digest(input_str), source_digest(module))
+
+    status = 0
+    data = None
+    try:
+        for part in parts:
+            hit = False
+            if use_answers:
+                hit, answer = answers.get(args.day, part, *key)
+            if not hit:
+                if data is None:
+                    data = run_phase("parse", parse, input_str)
+                answer = run_phase(f"part{part}", get_solver(module, part), data)
+                if use_answers:
+                    answers.put(args.day, part, *key, answer, timings[f"part{part}"])
+            print(f"part {part}: {answer}")
+    except MemoryBudgetExceeded as e:
+        print(f"memory budget exceeded: {e}", file=sys.stderr)
+        status = 1
+
+    if args.timings:
+        for phase, elapsed in timings.items():
+            print(f"{phase}: {elapsed * 1000:.2f} ms", file=sys.stderr)
+    if track_memory:
+        print(format_memory(memories), file=sys.stderr)
+    if args.profile:
+        profile = instrument.snapshot()
+        if track_memory:
+            profile["memory"] = [memory.to_dict() for memory in memories]
+        args.profile.write_text(json.dumps(profile, indent=2))
+    return status
+
+
+def verify(args: argparse.Namespace) -> int:
+    from verify import run_examples
+
+    failed = 0
+    for day in args.days or available_days():
+        module = load_day(day)
+        try:
+            count = run_examples(module.__name__)
+        except AssertionError as e:
+            failed += 1
+            print(f"day {day:02d}: FAILED {e}")
+        except Exception as e:
+            failed += 1
+            print(f"day {day:02d}: FAILED {type(e).__name__}: {e}")
+        else:
+            print(f"day {day:02d}: {count} example(s) ok")
+    return 1 if failed else 0
+
+
+def bench(args: argparse.Namespace) -> int:
+    from aoc.bench import bench_day, build_report, format_report
+
+    measurements = []
+    for day in args.days or available_days():
+        measurements += bench_day(
+            day, args.scales, repeat=args.repeat, budget=args.budget, seed=args.seed
+        )
+    report = build_report(
+        measurements, scales=args.scales, repeat=args.repeat, seed=args.seed
+    )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    print(format_report(report))
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    from aoc.compare import (
+        DEFAULT_BASELINE,
+        compare_reports,
+        format_comparisons,
+        load_baseline,
+        run_benchmarks,
+        save_baseline,
+    )
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.save:
+        days = args.days or available_days()
+        scales = args.scales or [1, 10]
+    else:
+        baseline = load_baseline(baseline_path)
+        days = args.days or sorted({r["day"] for r in baseline["results"]})
+        scales = args.scales or baseline["settings"]["scales"]
+
+    report = run_benchmarks(
+        days, scales, repeat=args.repeat, budget=args.budget, seed=args.seed
+    )
+    if args.save:
+        save_baseline(report, baseline_path)
+        print(f"saved baseline for days {days} at scales {scales} to {baseline_path}")
+        return 0
+
+    comparisons = compare_reports(
+        baseline,
+        report,
+        threshold=args.threshold,
+        memory_threshold=args.memory_threshold,
+        alpha=args.alpha,
+    )
+    print(format_comparisons(comparisons))
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+def batch(args: argparse.Namespace) -> int:
+    from aoc.batch import build_jobs, format_results, run_batch
+
+    parts = [args.part] if args.part else [1, 2]
+    jobs = build_jobs(args.days or available_days(), parts, args.inputs)
+    results = run_batch(jobs, workers=args.workers, use_cache=not args.no_cache)
+    print(format_results(results))
+    return 0 if all(result.ok for result in results) else 1
+
+
+def serve(args: argparse.Namespace) -> int:
+    import asyncio
+
+    from aoc.daemon import DEFAULT_SOCKET, serve
+
+    try:
+        asyncio.run(
+            serve(
+                socket_path=args.socket or DEFAULT_SOCKET,
+                port=args.port,
+                workers=args.workers,
+                max_parsed=args.max_parsed,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def query(args: argparse.Namespace) -> int:
+    from aoc.daemon import DEFAULT_SOCKET, query
+
+    status = 0
+    for part in [args.part] if args.part else [1, 2]:
+        request = {"day": args.day, "part": part}
+        if args.input:
+            request["input"] = str(args.input.resolve())
+        response = query(
+            request, socket_path=args.socket or DEFAULT_SOCKET, port=args.port
+        )
+        if "error" in response:
+            print(f"part {part}: ERROR {response['error']}", file=sys.stderr)
+            status = 1
+        else:
+            print(f"part {part}: {response['answer']}")
+    return status
+
+
+def generate(args: argparse.Namespace) -> int:
+    from aoc.generators import generate
+
+    sys.stdout.write(generate(args.day, args.scale, args.seed))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="aoc")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="solve a day's puzzle input")
+    run_parser.add_argument("day", type=int)
+    run_parser.add_argument("--part", type=int, choices=(1, 2))
+    run_parser.add_argument("--input", type=Path, help="defaults to inputs/dayNN.txt")
+    run_parser.add_argument(
+        "--timings", action="store_true", help="report per-phase timings on stderr"
+    )
+    run_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always parse and solve, ignoring the parse and answer caches",
+    )
+    run_parser.add_argument(
+        "--profile", type=Path, help="write solver counters and timers to this JSON file"
+    )
+    run_parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="report peak RSS and top allocators for each phase on stderr",
+    )
+    run_parser.add_argument(
+        "--memory-budget",
+        metavar="SIZE",
+        help="fail if a phase's peak memory exceeds SIZE, e.g. 512M (implies --memory)",
+    )
+    run_parser.add_argument(
+        "--top", type=int, default=5, help="allocation sites to report per phase"
+    )
+    run_parser.set_defaults(func=run)
+
+    verify_parser = subparsers.add_parser("verify", help="check the worked examples")
+    verify_parser.add_argument("days", type=int, nargs="*")
+    verify_parser.set_defaults(func=verify)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="time each phase over synthetic inputs of growing size"
+    )
+    bench_parser.add_argument("days", type=int, nargs="*")
+    bench_parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100])
+    bench_parser.add_argument("--repeat", type=int, default=3)
+    bench_parser.add_argument(
+        "--budget",
+        type=float,
+        default=10.0,
+        help="seconds a single phase may take before larger scales are skipped",
+    )
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument("--output", type=Path, help="write the JSON report here")
+    bench_parser.set_defaults(func=bench)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="check for performance regressions against a stored baseline"
+    )
+    compare_parser.add_argument("days", type=int, nargs="*")
+    compare_parser.add_argument(
+        "--save", action="store_true", help="record a new baseline instead of comparing"
+    )
+    compare_parser.add_argument(
+        "--baseline", type=Path, help="default: benchmarks/baseline.json"
+    )
+    compare_parser.add_argument(
+        "--scales", type=float, nargs="+", help="default: 1 10, or the baseline's"
+    )
+    compare_parser.add_argument("--repeat", type=int, default=7)
+    compare_parser.add_argument("--budget", type=float, default=10.0)
+    compare_parser.add_argument("--seed", type=int, default=0)
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown of the median time, as a fraction (default 0.1)",
+    )
+    compare_parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=0.1,
+        help="allowed growth of the traced memory peak, as a fraction (default 0.1)",
+    )
+    compare_parser.add_argument(
+        "--alpha", type=float, default=0.05, help="significance level for slowdowns"
+    )
+    compare_parser.set_defaults(func=compare)
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="solve every day/part/input on a process pool"
+    )
+    batch_parser.add_argument("days", type=int, nargs="*")
+    batch_parser.add_argument("--part", type=int, choices=(1, 2))
+    batch_parser.add_argument(
+        "--inputs", type=Path, nargs="+", help="input directories (default: inputs/)"
+    )
+    batch_parser.add_argument(
+        "--workers", type=int, help="pool size (default: one per core)"
+    )
+    batch_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always parse and solve, ignoring the parse and answer caches",
+    )
+    batch_parser.set_defaults(func=batch)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="keep the solvers warm in a local server"
+    )
+    serve_parser.add_argument(
+        "--socket", type=Path, help="unix socket path (default: .cache/aoc.sock)"
+    )
+    serve_parser.add_argument("--port", type=int, help="listen on localhost TCP instead")
+    serve_parser.add_argument("--workers", type=int, help="solver threads")
+    serve_parser.add_argument(
+        "--max-parsed", type=int, default=64, help="parsed inputs to keep in memory"
+    )
+    serve_parser.set_defaults(func=serve)
+
+    query_parser = subparsers.add_parser("query", help="ask a running server to solve")
+    query_parser.add_argument("day", type=int)
+    query_parser.add_argument("--part", type=int, choices=(1, 2))
+    query_parser.add_argument("--input", type=Path, help="defaults to inputs/dayNN.txt")
+    query_parser.add_argument("--socket", type=Path)
+    query_parser.add_argument("--port", type=int)
+    query_parser.set_defaults(func=query)
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="print a synthetic input for a day"
+    )
+    generate_parser.add_argument("day", type=int)
+    generate_parser.add_argument("--scale", type=float, default=1)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.set_defaults(func=generate)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
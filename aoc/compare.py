@@ -0,0 +1,209 @@
+"""
+compare.py
+
+Guard against performance regressions by comparing fresh benchmark samples with a
+stored baseline.
+
+A baseline is a bench report (see bench.py) with several timing samples and a traced
+memory peak for every (day, phase, scale). A phase has regressed when its median time
+is more than <threshold> slower than the baseline's *and* a one-sided Mann-Whitney U
+test says the slowdown is significant, or when its memory peak grew by more than
+<memory_threshold>. The rank test doesn't assume normally distributed timings, and one
+noisy sample can't fail the gate on its own.
+
+The gate also fails when it can't vouch for a phase: when the current run skipped or
+never reached something the baseline measured, or when there are too few samples for
+the rank test to ever reach <alpha>.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+from statistics import median
+from typing import Any
+
+from aoc.bench import bench_day, build_report
+from aoc.days import ROOT_DIR
+
+DEFAULT_BASELINE = ROOT_DIR / "benchmarks" / "baseline.json"
+
+# above this many rank arrangements, fall back to the normal approximation
+EXACT_TEST_LIMIT = 20_000
+
+# growth smaller than this is allocator noise, whatever the ratio
+MEMORY_NOISE_BYTES = 64 * 1024
+
+
+@dataclass
+class Comparison:
+    day: int
+    phase: str
+    scale: float
+    baseline_seconds: float
+    current_seconds: float | None
+    p_value: float | None
+    baseline_peak_bytes: int | None
+    current_peak_bytes: int | None
+    slower: bool = False
+    bigger: bool = False
+    underpowered: bool = False
+    missing: str | None = None  # "SKIPPED" or "MISSING" when there's nothing to compare
+
+    @property
+    def ratio(self) -> float | None:
+        if self.current_seconds is None:
+            return None
+        return self.current_seconds / self.baseline_seconds
+
+    @property
+    def regressed(self) -> bool:
+        return self.slower or self.bigger or self.underpowered or bool(self.missing)
+
+
+def mann_whitney_greater(current: list[float], baseline: list[float]) -> float:
+    """p-value for the hypothesis that <current> tends to be larger than <baseline>."""
+    n, m = len(current), len(baseline)
+    values = sorted(current + baseline)
+    first, last = {}, {}
+    for position, value in enumerate(values, 1):
+        first.setdefault(value, position)
+        last[value] = position
+    rank = {value: (first[value] + last[value]) / 2 for value in first}  # ties share
+    u = sum(rank[value] for value in current) - n * (n + 1) / 2
+
+    if math.comb(n + m, n) <= EXACT_TEST_LIMIT:
+        extreme = total = 0
+        for chosen in combinations([rank[value] for value in values], n):
+            total += 1
+            extreme += sum(chosen) - n * (n + 1) / 2 >= u
+        return extreme / total
+
+    mean = n * m / 2
+    sd = math.sqrt(n * m * (n + m + 1) / 12)
+    return 0.5 * math.erfc((u - 0.5 - mean) / (sd * math.sqrt(2)))
+
+
+def smallest_p_value(n: int, m: int) -> float:
+    """The p-value of the most extreme arrangement of <n> and <m> samples, which is as
+    significant as the rank test can ever be."""
+    return 1 / math.comb(n + m, n)
+
+
+def run_benchmarks(
+    days: list[int], scales: list[float], repeat: int, budget: float, seed: int
+) -> dict[str, Any]:
+    measurements = []
+    for day in days:
+        measurements += bench_day(
+            day,
+            scales,
+            repeat=repeat,
+            budget=budget,
+            seed=seed,
+            track_memory=True,
+            min_samples=repeat,
+        )
+    return build_report(measurements, scales=scales, repeat=repeat, seed=seed)
+
+
+def save_baseline(report: dict[str, Any], path: Path = DEFAULT_BASELINE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = 0.1,
+    memory_threshold: float = 0.1,
+    alpha: float = 0.05,
+) -> list[Comparison]:
+    def keyed(report):
+        return {(r["day"], r["phase"], r["scale"]): r for r in report["results"]}
+
+    baseline_results, current_results = keyed(baseline), keyed(current)
+    days = {day for day, _, _ in current_results}
+    scales = set(current["settings"]["scales"])
+    comparisons = []
+    for key in sorted(baseline_results):
+        before, after = baseline_results[key], current_results.get(key)
+        day, _, scale = key
+        if not before["samples"] or day not in days or scale not in scales:
+            continue
+        before_seconds = median(before["samples"])
+        before_peak = before["traced_peak_bytes"]
+        if after is None or not after["samples"]:
+            comparisons.append(
+                Comparison(
+                    *key,
+                    baseline_seconds=before_seconds,
+                    current_seconds=None,
+                    p_value=None,
+                    baseline_peak_bytes=before_peak,
+                    current_peak_bytes=None,
+                    missing="MISSING" if after is None else "SKIPPED",
+                )
+            )
+            continue
+        after_seconds = median(after["samples"])
+        p_value = mann_whitney_greater(after["samples"], before["samples"])
+        after_peak = after["traced_peak_bytes"]
+        comparisons.append(
+            Comparison(
+                *key,
+                baseline_seconds=before_seconds,
+                current_seconds=after_seconds,
+                p_value=p_value,
+                baseline_peak_bytes=before_peak,
+                current_peak_bytes=after_peak,
+                slower=after_seconds > before_seconds * (1 + threshold)
+                and p_value < alpha,
+                bigger=before_peak is not None
+                and after_peak is not None
+                and after_peak > before_peak * (1 + memory_threshold)
+                and after_peak - before_peak > MEMORY_NOISE_BYTES,
+                underpowered=smallest_p_value(
+                    len(after["samples"]), len(before["samples"])
+                )
+                >= alpha,
+            )
+        )
+    return comparisons
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    lines = [
+        f"{'day':>3} {'phase':<6} {'scale':>6} {'baseline s':>11} {'current s':>11} "
+        f"{'ratio':>6} {'p':>6} {'peak KiB':>17}  status"
+    ]
+    for c in comparisons:
+        if c.baseline_peak_bytes is None or c.current_peak_bytes is None:
+            peaks = "-"
+        else:
+            peaks = f"{c.baseline_peak_bytes // 1024}->{c.current_peak_bytes // 1024}"
+        if c.missing:
+            timing = f"{'-':>11} {'-':>6} {'-':>6}"
+        else:
+            timing = f"{c.current_seconds:>11.4f} {c.ratio:>6.2f} {c.p_value:>6.3f}"
+        status = c.missing or ", ".join(
+            reason
+            for reason, failed in (
+                ("SLOWER", c.slower),
+                ("BIGGER", c.bigger),
+                ("UNDERPOWERED", c.underpowered),
+            )
+            if failed
+        )
+        lines.append(
+            f"{c.day:>3} {c.phase:<6} {c.scale:>6g} {c.baseline_seconds:>11.4f} "
+            f"{timing} {peaks:>17}  {status or 'ok'}"
+        )
+    regressions = sum(c.regressed for c in comparisons)
+    lines.append(f"\n{len(comparisons)} compared, {regressions} regressed")
+    return "\n".join(lines)
@@ -0,0 +1,163 @@
+"""
+daemon.py
+
+A long-lived solver process, so repeated queries skip interpreter startup, the numpy
+import, parsing, and warming up caches like day11's analyze_growth.
+
+The server listens on a Unix socket (or TCP on localhost) and speaks JSON lines:
+
+    -> {"day": 6, "part": 2, "input": "/abs/path/to/input.txt"}
+    <- {"day": 6, "part": 2, "answer": 1951, "seconds": 0.0004, "parsed": false, ...}
+
+"input" is optional (defaulting to inputs/dayNN.txt), and "input_str" can be sent
+instead of a path. Requests are served concurrently, with solving done on a thread
+pool. Parsed inputs are kept in memory (least recently used are dropped past
+<max_parsed>), answers go through the shared AnswerStore, and a day's solver only runs
+on one thread at a time since some keep module-level state.
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from aoc.answers import AnswerStore, plain
+from aoc.days import available_days, default_input, get_solver, load_day, source_digest
+from aoc.parse_cache import DEFAULT_CACHE_DIR, input_digest
+
+DEFAULT_SOCKET = DEFAULT_CACHE_DIR / "aoc.sock"
+
+
+class SolverState:
+    def __init__(self, max_parsed: int = 64):
+        self.modules = {day: load_day(day) for day in available_days()}
+        self.code_digests = {
+            day: source_digest(module) for day, module in self.modules.items()
+        }
+        self.day_locks = {day: threading.Lock() for day in self.modules}
+        self.parsed: OrderedDict[tuple[int, str], Any] = OrderedDict()
+        self.parsed_lock = threading.Lock()
+        self.max_parsed = max_parsed
+        self.thread_local = threading.local()
+
+    def answers(self) -> AnswerStore:
+        # sqlite connections can't be shared between threads
+        if not hasattr(self.thread_local, "answers"):
+            self.thread_local.answers = AnswerStore()
+        return self.thread_local.answers
+
+    def get_parsed(self, day: int, digest: str, input_str: str) -> tuple[bool, Any]:
+        key = (day, digest)
+        with self.parsed_lock:
+            if key in self.parsed:
+                self.parsed.move_to_end(key)
+                return True, self.parsed[key]
+        data = self.modules[day].parse_input(input_str)
+        with self.parsed_lock:
+            self.parsed[key] = data
+            while len(self.parsed) > self.max_parsed:
+                self.parsed.popitem(last=False)
+        return False, data
+
+    def solve(self, request: dict[str, Any]) -> dict[str, Any]:
+        start = time.perf_counter()
+        day, part = int(request["day"]), int(request.get("part", 1))
+        if day not in self.modules:
+            raise ValueError(f"no solution for day {day}")
+        if "input_str" in request:
+            input_str = request["input_str"]
+        else:
+            input_str = Path(request.get("input") or default_input(day)).read_text()
+        digest = input_digest(input_str)
+        response = {"day": day, "part": part}
+
+        hit, answer = self.answers().get(day, part, digest, self.code_digests[day])
+        if not hit:
+            with self.day_locks[day]:
+                warm, data = self.get_parsed(day, digest, input_str)
+                solve_start = time.perf_counter()
+                answer = get_solver(self.modules[day], part)(data)
+                solve_seconds = time.perf_counter() - solve_start
+            self.answers().put(
+                day, part, digest, self.code_digests[day], answer, solve_seconds
+            )
+            response["parsed"] = not warm
+        response |= {
+            "answer": answer,
+            "cached_answer": hit,
+            "seconds": time.perf_counter() - start,
+        }
+        return response
+
+
+async def handle_client(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    state: SolverState,
+    executor: ThreadPoolExecutor,
+) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+                response = await loop.run_in_executor(executor, state.solve, request)
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            try:
+                encoded = json.dumps(response, default=plain)
+            except TypeError as e:
+                encoded = json.dumps({"error": f"TypeError: {e}"})
+            writer.write(encoded.encode() + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(
+    socket_path: Path | None = DEFAULT_SOCKET,
+    port: int | None = None,
+    workers: int | None = None,
+    max_parsed: int = 64,
+) -> None:
+    state = SolverState(max_parsed=max_parsed)
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    async def handle(reader, writer):
+        await handle_client(reader, writer, state, executor)
+
+    if port is not None:
+        server = await asyncio.start_server(handle, "127.0.0.1", port)
+        where = f"127.0.0.1:{port}"
+    else:
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        socket_path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(handle, str(socket_path))
+        where = str(socket_path)
+    print(f"serving {len(state.modules)} days on {where}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def query(
+    request: dict[str, Any],
+    socket_path: Path | None = DEFAULT_SOCKET,
+    port: int | None = None,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """Send one request to a running server and return its response."""
+    if port is not None:
+        connection = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        connection.connect(str(socket_path))
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
@@ -0,0 +1,76 @@
+"""
+days.py
+
+Discover and load the src/dayNN.py modules.
+
+The day modules are plain scripts that import each other's helpers (verify, ...) as
+top-level modules, so src/ is put on sys.path and each day is imported by its bare name.
+"""
+
+import hashlib
+import importlib
+import re
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT_DIR / "src"
+INPUTS_DIR = ROOT_DIR / "inputs"
+
+DAY_PATTERN = re.compile(r"^day(\d\d)\.py$")
+
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def available_days() -> list[int]:
+    return sorted(
+        int(match.group(1))
+        for path in SRC_DIR.iterdir()
+        if (match := DAY_PATTERN.match(path.name))
+    )
+
+
+def module_name(day: int) -> str:
+    return f"day{day:02d}"
+
+
+def load_day(day: int) -> ModuleType:
+    if day not in available_days():
+        raise ValueError(f"no solution for day {day}")
+    return importlib.import_module(module_name(day))
+
+
+def default_input(day: int) -> Path:
+    return INPUTS_DIR / f"{module_name(day)}.txt"
+
+
+def get_solver(module: ModuleType, part: int) -> Callable:
+    try:
+        return getattr(module, f"part{part}")
+    except AttributeError:
+        raise ValueError(f"{module.__name__} has no part{part}") from None
+
+
+def source_digest(module: ModuleType) -> str:
+    """sha256 of the module's source, plus that of any src/ helper modules it uses, so
+    that editing either invalidates anything derived from the module's output."""
+    paths = {Path(module.__file__)}
+    for value in vars(module).values():
+        if isinstance(value, ModuleType):
+            dependency = value
+        elif isinstance(owner := getattr(value, "__module__", None), str):
+            dependency = sys.modules.get(owner)
+        else:
+            continue
+        path = getattr(dependency, "__file__", None)
+        if path and Path(path).parent == SRC_DIR:
+            paths.add(Path(path))
+
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
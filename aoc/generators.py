@@ -0,0 +1,226 @@
+"""
+generators.py
+
+Synthetic puzzle inputs at a multiple of the real puzzle's size.
+
+Each generator takes a scale (1 is roughly the size of the real input) and a seeded
+random.Random, and returns the input text. Grids grow in both dimensions, so a scale of
+100 means 100x the cells rather than 100x the side length. Inputs are valid for the
+solvers as written: e.g. day05 rules form a total order over the pages, and day08 never
+puts two antennas of one frequency on the same row.
+"""
+
+import math
+import random
+import string
+from typing import Callable
+
+Generator = Callable[[float, random.Random], str]
+
+
+def scaled(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def side(base: int, scale: float) -> int:
+    """Side length of a square grid with <scale> times the cells of a <base> x <base> one."""
+    return max(1, round(base * math.sqrt(scale)))
+
+
+def day01(scale: float, rng: random.Random) -> str:
+    rows = scaled(1000, scale)
+    return "".join(
+        f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}\n"
+        for _ in range(rows)
+    )
+
+
+def day02(scale: float, rng: random.Random) -> str:
+    reports = []
+    for _ in range(scaled(1000, scale)):
+        sign = rng.choice((-1, 1))
+        levels = [rng.randint(20, 80)]
+        for _ in range(rng.randint(4, 7)):
+            step = rng.randint(1, 3) if rng.random() < 0.9 else rng.randint(-2, 5)
+            levels.append(levels[-1] + sign * step)
+        reports.append(" ".join(str(level) for level in levels))
+    return "\n".join(reports) + "\n"
+
+
+def day03(scale: float, rng: random.Random) -> str:
+    junk = string.ascii_letters + string.digits + string.punctuation + " "
+    tokens = ["do()", "don't()", "mul(", ")", ","]
+    chunks = []
+    length = 0
+    target = scaled(19000, scale)
+    while length < target:
+        roll = rng.random()
+        if roll < 0.08:
+            chunk = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+        elif roll < 0.1:
+            chunk = rng.choice(tokens)
+        elif roll < 0.102:
+            chunk = "\n"
+        else:
+            chunk = "".join(rng.choices(junk, k=rng.randint(1, 8)))
+        chunks.append(chunk)
+        length += len(chunk)
+    return "".join(chunks) + "\n"
+
+
+def day04(scale: float, rng: random.Random) -> str:
+    n = side(140, scale)
+    return "".join("".join(rng.choices("XMAS", k=n)) + "\n" for _ in range(n))
+
+
+def day05(scale: float, rng: random.Random) -> str:
+    # every pair of pages gets a rule, so ~scale x the rules means sqrt(scale) x the pages
+    num_pages = max(3, side(49, scale))
+    pages = rng.sample(range(10, 10 + 10 * num_pages), num_pages)
+    rules = [
+        f"{pages[i]}|{pages[j]}"
+        for i in range(num_pages)
+        for j in range(i + 1, num_pages)
+    ]
+    rng.shuffle(rules)
+    rows = []
+    for _ in range(scaled(200, scale)):
+        length = rng.choice(range(5, min(23, num_pages) + 1, 2))
+        row = rng.sample(pages, length)
+        if rng.random() < 0.5:
+            row.sort(key=pages.index)
+        rows.append(",".join(str(page) for page in row))
+    return "\n".join(rules) + "\n\n" + "\n".join(rows) + "\n"
+
+
+def day06(scale: float, rng: random.Random) -> str:
+    n = side(130, scale)
+    cells = [["#" if rng.random() < 0.02 else "." for _ in range(n)] for _ in range(n)]
+    cells[n // 2][n // 2] = "^"
+    return "".join("".join(row) + "\n" for row in cells)
+
+
+def day07(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(scaled(850, scale)):
+        operands = [rng.randint(1, 99) for _ in range(rng.randint(3, 12))]
+        value = operands[0]
+        for operand in operands[1:]:
+            match rng.randrange(3):
+                case 0:
+                    value += operand
+                case 1:
+                    value *= operand
+                case 2:
+                    value = int(f"{value}{operand}")
+        if rng.random() < 0.3:
+            value += 1
+        lines.append(f"{value}: {' '.join(str(x) for x in operands)}")
+    return "\n".join(lines) + "\n"
+
+
+def day08(scale: float, rng: random.Random) -> str:
+    n = side(50, scale)
+    cells = [["."] * n for _ in range(n)]
+    frequencies = string.digits + string.ascii_letters
+    for frequency in rng.sample(frequencies, min(len(frequencies), scaled(40, scale))):
+        for row in rng.sample(range(n), min(n, 4)):
+            cells[row][rng.randrange(n)] = frequency
+    return "".join("".join(row) + "\n" for row in cells)
+
+
+def day09(scale: float, rng: random.Random) -> str:
+    num_files = scaled(10000, scale)
+    digits = []
+    for i in range(num_files):
+        digits.append(str(rng.randint(1, 9)))
+        if i < num_files - 1:
+            digits.append(str(rng.randint(0, 9)))
+    return "".join(digits)
+
+
+def day10(scale: float, rng: random.Random) -> str:
+    # diagonal bands of rising height, roughened so trails branch and dead-end
+    n = side(40, scale)
+    rows = []
+    for i in range(n):
+        row = []
+        for j in range(n):
+            height = (i + j) % 10
+            if rng.random() < 0.15:
+                height = rng.randrange(10)
+            row.append(str(height))
+        rows.append("".join(row))
+    return "\n".join(rows) + "\n"
+
+
+def day11(scale: float, rng: random.Random) -> str:
+    return " ".join(str(rng.randint(0, 10**7)) for _ in range(scaled(8, scale))) + "\n"
+
+
+def day12(scale: float, rng: random.Random) -> str:
+    # blocky regions: upsample a coarse grid of plants, then sprinkle some noise
+    n = side(140, scale)
+    block = 5
+    coarse_n = n // block + 1
+    coarse = [
+        rng.choices(string.ascii_uppercase, k=coarse_n) for _ in range(coarse_n)
+    ]
+    rows = []
+    for i in range(n):
+        row = []
+        for j in range(n):
+            plant = coarse[i // block][j // block]
+            if rng.random() < 0.05:
+                plant = rng.choice(string.ascii_uppercase)
+            row.append(plant)
+        rows.append("".join(row))
+    return "\n".join(rows) + "\n"
+
+
+def day13(scale: float, rng: random.Random) -> str:
+    machines = []
+    while len(machines) < scaled(320, scale):
+        ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+        det = ax * by - ay * bx
+        if det == 0:
+            continue
+        a_presses, b_presses = rng.randint(0, 100), rng.randint(0, 100)
+        prize_x = ax * a_presses + bx * b_presses
+        prize_y = ay * a_presses + by * b_presses
+        if rng.random() < 0.3:
+            # unwinnable: nudge the prize off the lattice so no integer solution exists
+            prize_x += rng.randint(1, 50)
+            if (prize_x * by - prize_y * bx) % det == 0:
+                continue
+        machines.append(
+            f"Button A: X+{ax}, Y+{ay}\n"
+            f"Button B: X+{bx}, Y+{by}\n"
+            f"Prize: X={prize_x}, Y={prize_y}\n"
+        )
+    return "\n".join(machines)
+
+
+GENERATORS: dict[int, Generator] = {
+    1: day01,
+    2: day02,
+    3: day03,
+    4: day04,
+    5: day05,
+    6: day06,
+    7: day07,
+    8: day08,
+    9: day09,
+    10: day10,
+    11: day11,
+    12: day12,
+    13: day13,
+}
+
+
+def generate(day: int, scale: float = 1, seed: int = 0) -> str:
+    try:
+        generator = GENERATORS[day]
+    except KeyError:
+        raise ValueError(f"no input generator for day {day}") from None
+    return generator(scale, random.Random(f"{day}:{scale}:{seed}"))
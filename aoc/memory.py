@@ -0,0 +1,185 @@
+"""
+memory.py
+
+Per-phase memory accounting: the tracemalloc peak, the process's peak RSS, and the
+allocation sites holding the most memory at (or near) the phase's traced peak.
+
+Peak RSS is per phase on Linux, where the high-water mark can be reset through
+/proc/self/clear_refs; elsewhere it is the peak for the process so far. tracemalloc sees
+numpy's buffers as well as python objects, but slows everything down while it is on.
+
+A phase's memory is often freed before it returns, so the top allocation sites come from
+snapshots taken by a sampling thread while the phase runs: a fresh one each time the
+traced total has grown by SNAPSHOT_GROWTH since the last, plus one at the end if that is
+higher still. Peaks shorter than SAMPLE_INTERVAL can be missed.
+"""
+
+import re
+import resource
+import sys
+import threading
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+CLEAR_REFS = Path("/proc/self/clear_refs")
+STATUS = Path("/proc/self/status")
+
+SIZE_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30}
+
+SAMPLE_INTERVAL = 0.01
+SNAPSHOT_GROWTH = 1.1
+
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+
+@dataclass
+class PhaseMemory:
+    phase: str
+    traced_peak_bytes: int
+    rss_peak_bytes: int | None
+    top_allocators: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def peak_bytes(self) -> int:
+        """What a budget is checked against: peak RSS where we have it."""
+        return self.rss_peak_bytes or self.traced_peak_bytes
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def parse_size(size: str) -> int:
+    """'512M' -> 536870912. Units are K, M or G (powers of 1024); no unit means bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)i?B?\s*", size.upper())
+    if not match:
+        raise ValueError(f"can't parse memory size {size!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def format_size(num_bytes: int | None) -> str:
+    if num_bytes is None:
+        return "-"
+    if num_bytes < 2**20:
+        return f"{num_bytes / 2**10:.1f} KiB"
+    return f"{num_bytes / 2**20:.1f} MiB"
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark, if we can."""
+    try:
+        CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_bytes() -> int | None:
+    try:
+        match = re.search(r"^VmHWM:\s+(\d+) kB", STATUS.read_text(), re.MULTILINE)
+    except OSError:
+        match = None
+    if match:
+        return int(match.group(1)) * 1024
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def top_allocators(snapshot: tracemalloc.Snapshot, limit: int) -> list[dict[str, Any]]:
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+        ]
+    )
+    stats = snapshot.statistics("lineno")[:limit]
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in stats
+    ]
+
+
+class PeakSampler(threading.Thread):
+    """Polls the traced total while a phase runs and keeps the top allocators from the
+    largest snapshot it has seen. Only the summary is kept, not the snapshot itself, so
+    holding it doesn't add to the phase's peak."""
+
+    def __init__(self, top: int):
+        super().__init__(daemon=True)
+        self.top = top
+        self.traced_bytes = -1
+        self.top_allocators: list[dict[str, Any]] = []
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            self.sample(SNAPSHOT_GROWTH)
+
+    def sample(self, growth: float = 1.0) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.traced_bytes * growth:
+            self.top_allocators = top_allocators(tracemalloc.take_snapshot(), self.top)
+            self.traced_bytes = current
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+        self.sample()
+
+
+def measure(phase: str, func: Callable, *args, top: int = 10) -> tuple[Any, PhaseMemory]:
+    """Run func(*args), returning its result and the memory used along the way."""
+    reset_peak_rss()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.clear_traces()
+    tracemalloc.reset_peak()
+    sampler = PeakSampler(top)
+    sampler.start()
+    try:
+        result = func(*args)
+    finally:
+        sampler.stop()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+
+    memory = PhaseMemory(
+        phase=phase,
+        traced_peak_bytes=traced_peak,
+        rss_peak_bytes=peak_rss_bytes(),
+        top_allocators=sampler.top_allocators,
+    )
+    return result, memory
+
+
+def check_budget(memory: PhaseMemory, budget_bytes: int | None) -> None:
+    if budget_bytes is not None and memory.peak_bytes > budget_bytes:
+        raise MemoryBudgetExceeded(
+            f"{memory.phase} peaked at {format_size(memory.peak_bytes)}, "
+            f"over the {format_size(budget_bytes)} budget"
+        )
+
+
+def format_memory(memories: list[PhaseMemory]) -> str:
+    lines = [f"{'phase':<8} {'traced peak':>12} {'peak rss':>12}"]
+    for memory in memories:
+        lines.append(
+            f"{memory.phase:<8} {format_size(memory.traced_peak_bytes):>12} "
+            f"{format_size(memory.rss_peak_bytes):>12}"
+        )
+        for allocator in memory.top_allocators:
+            lines.append(
+                f"    {format_size(allocator['size_bytes']):>10}  "
+                f"{allocator['count']:>8} blocks  {allocator['location']}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,141 @@
+"""
+parse_cache.py
+
+On-disk cache of parse_input results, keyed by the sha256 of the input bytes and the
+day's source digest (so editing the parser, or anything it uses, is a miss).
+
+Each entry is a directory holding a pickle of the parsed data, with every numpy array
+split out into its own .npy file and loaded back memory-mapped (copy-on-write, so the
+solvers can still scribble on them). Loading an entry bumps its mtime; once the cache
+grows past its size cap the least recently used entries are deleted.
+
+The location and size cap can be set with AOC_CACHE_DIR and AOC_PARSE_CACHE_MB.
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import uuid
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from aoc.days import ROOT_DIR, source_digest
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("AOC_CACHE_DIR", ROOT_DIR / ".cache"))
+DEFAULT_MAX_BYTES = int(os.environ.get("AOC_PARSE_CACHE_MB", 1024)) * 2**20
+
+DATA_FILE = "data.pkl"
+
+
+def input_digest(input_str: str) -> str:
+    return hashlib.sha256(input_str.encode()).hexdigest()
+
+
+class ArrayPickler(pickle.Pickler):
+    """Pickle everything except numpy arrays, which go to <entry>/<n>.npy."""
+
+    def __init__(self, file, entry_dir: Path):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.entry_dir = entry_dir
+        self.num_arrays = 0
+
+    def persistent_id(self, obj: Any) -> str | None:
+        np = sys.modules.get("numpy")
+        if np is None or not isinstance(obj, np.ndarray) or obj.dtype.hasobject:
+            return None
+        name = f"{self.num_arrays}.npy"
+        np.save(self.entry_dir / name, obj, allow_pickle=False)
+        self.num_arrays += 1
+        return name
+
+
+class ArrayUnpickler(pickle.Unpickler):
+    def __init__(self, file, entry_dir: Path):
+        super().__init__(file)
+        self.entry_dir = entry_dir
+
+    def persistent_load(self, pid: str) -> Any:
+        import numpy as np
+
+        # a plain ndarray view: np.memmap's python-level __getitem__ slows scalar access
+        return np.load(self.entry_dir / pid, mmap_mode="c").view(np.ndarray)
+
+
+class ParseCache:
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir) / "parsed"
+        self.max_bytes = max_bytes
+
+    def key(self, module: ModuleType, input_str: str) -> str:
+        digest = input_digest(input_str)
+        return f"{module.__name__}-{digest[:32]}-{source_digest(module)[:16]}"
+
+    def load(self, key: str) -> tuple[bool, Any]:
+        """Return (hit, data)."""
+        entry_dir = self.cache_dir / key
+        try:
+            with (entry_dir / DATA_FILE).open("rb") as f:
+                data = ArrayUnpickler(f, entry_dir).load()
+            os.utime(entry_dir)
+        except FileNotFoundError:  # never stored, or evicted under our feet
+            return False, None
+        return True, data
+
+    def store(self, key: str, data: Any) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging_dir = self.cache_dir / f".tmp-{uuid.uuid4().hex}"
+        staging_dir.mkdir()
+        try:
+            with (staging_dir / DATA_FILE).open("wb") as f:
+                ArrayPickler(f, staging_dir).dump(data)
+            # rename is atomic, so concurrent writers of the same key can't tear an entry
+            staging_dir.rename(self.cache_dir / key)
+        except OSError:
+            if not (self.cache_dir / key).exists():
+                raise
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self.evict()
+
+    def parse(self, module: ModuleType, input_str: str) -> tuple[bool, Any]:
+        """Return (hit, parsed data), parsing and storing on a miss."""
+        key = self.key(module, input_str)
+        hit, data = self.load(key)
+        if not hit:
+            data = module.parse_input(input_str)
+            self.store(key, data)
+        return hit, data
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        """(last used, size in bytes, path) for every entry."""
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            if entry_dir.name.startswith("."):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry_dir.iterdir())
+                entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def evict(self) -> None:
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
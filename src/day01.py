@@ -7,30 +7,217 @@ Add up all the pairwise differences and return the sum.
 Part two: calculate the similarity score by adding up each number in the left list * the number of occurrences of that number in the right list.
 """
 
-from collections import Counter
+import tempfile
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
 
+import numpy as np
 
-def parse_input(input_str: str) -> list[list[int]]:
-    """Return two lists of ints: the left-hand numbers, and the right-hand numbers."""
-    left = []
-    right = []
-    for line in input_str.split("\n"):
-        if line:
-            left_val, right_val = line.strip().split()
-            left.append(int(left_val))
-            right.append(int(right_val))
-    return [left, right]
+from tokens import parse_int_lines
+from verify import example, run_examples
 
 
-def part1(input_data: list[list[int]]) -> int:
+def parse_input(input_str: str | bytes) -> np.ndarray:
+    """Return a (2, n) int64 array: the left-hand numbers, and the right-hand numbers.
+
+    A line without exactly two numbers is an error rather than shifting every pair
+    after it. Blank lines are skipped.
+    """
+    values, per_line = parse_int_lines(input_str)
+    if (per_line != 2).any():
+        raise ValueError("expected two numbers on every line")
+    return values.reshape(-1, 2).T
+
+
+def load_input(path: str | Path) -> np.ndarray:
+    """parse_input, straight from the bytes of the file at <path>."""
+    return parse_input(Path(path).read_bytes())
+
+
+def part1(input_data: np.ndarray) -> int:
     left, right = input_data
-    return sum(abs(x - y) for x, y in zip(sorted(left), sorted(right)))
+    return int(np.abs(np.sort(left) - np.sort(right)).sum())
 
 
-def part2(input_data: list[list[int]]) -> int:
+def part2(input_data: np.ndarray) -> int:
     left, right = input_data
-    right_counts = Counter(right)
-    return sum(val * right_counts[val] for val in left)
+    values, counts = np.unique(right, return_counts=True)
+    if not len(values):
+        return 0
+    # where each left value would sit among the distinct right values, and whether
+    # it's actually there
+    positions = np.minimum(np.searchsorted(values, left), len(values) - 1)
+    occurrences = np.where(values[positions] == left, counts[positions], 0)
+    # python ints, as in similarity, so the products can't overflow int64
+    return int((left.astype(object) * occurrences).sum())
+
+
+# A spilled run is raw (value, count) int64 pairs.
+RUN_ROW_BYTES = 2 * np.dtype(np.int64).itemsize
+
+
+def write_run(path: Path, column: np.ndarray) -> None:
+    """Spill one chunk of a column as a sorted, run-length encoded table of
+    (value, count) rows, stored as raw int64 pairs."""
+    values, counts = np.unique(column, return_counts=True)
+    path.write_bytes(np.stack([values, counts], axis=1).tobytes())
+
+
+class RunReader:
+    """A spilled run read <block_rows> rows at a time. <buffer> holds the rows not yet
+    consumed from the current block, and is empty once the run is used up."""
+
+    def __init__(self, path: Path, block_rows: int):
+        self.path = path
+        self.block_rows = block_rows
+        self.rows = path.stat().st_size // RUN_ROW_BYTES
+        self.position = 0
+        self.buffer = np.zeros((0, 2), dtype=np.int64)
+        self.refill()
+
+    def refill(self) -> None:
+        if len(self.buffer) or self.position >= self.rows:
+            return
+        count = min(self.block_rows, self.rows - self.position)
+        self.buffer = np.fromfile(
+            self.path,
+            dtype=np.int64,
+            count=2 * count,
+            offset=self.position * RUN_ROW_BYTES,
+        ).reshape(-1, 2)
+        self.position += count
+
+    @property
+    def done(self) -> bool:
+        return not len(self.buffer)
+
+    def drop(self, rows: int) -> np.ndarray:
+        """Consume the first <rows> rows of the buffer, returning them."""
+        dropped, self.buffer = self.buffer[:rows], self.buffer[rows:]
+        self.refill()
+        return dropped
+
+    def take_through(self, value: int) -> np.ndarray:
+        """Consume the buffered rows up to and including <value>."""
+        return self.drop(int(np.searchsorted(self.buffer[:, 0], value, side="right")))
+
+
+def merge_blocks(readers: list[RunReader]) -> Iterator[np.ndarray]:
+    """k-way merge runs into sorted (value, count) blocks, with the counts of equal
+    values combined.
+
+    Every row up to the smallest last value buffered by any run can go out at once:
+    nothing still unread can come before it.
+    """
+    while live := [reader for reader in readers if not reader.done]:
+        bound = min(int(reader.buffer[-1, 0]) for reader in live)
+        rows = np.concatenate([reader.take_through(bound) for reader in live])
+        rows = rows[np.argsort(rows[:, 0], kind="stable")]
+        values, firsts = np.unique(rows[:, 0], return_index=True)
+        yield np.stack([values, np.add.reduceat(rows[:, 1], firsts)], axis=1)
+
+
+def merge_runs(paths: list[Path], block_rows: int, fan_in: int) -> Path:
+    """Merge spilled runs into one, at most <fan_in> at a time, in as many passes as it
+    takes. Each merged run replaces the runs it came from."""
+    while len(paths) > 1:
+        merged = []
+        for start in range(0, len(paths), fan_in):
+            group = paths[start : start + fan_in]
+            output = group[0].with_name(f"{group[0].stem}-{len(paths)}.run")
+            with output.open("wb") as f:
+                for block in merge_blocks([RunReader(p, block_rows) for p in group]):
+                    f.write(block.tobytes())
+            for path in group:
+                path.unlink()
+            merged.append(output)
+        paths = merged
+    return paths[0]
+
+
+def distance_sum(left: RunReader, right: RunReader) -> int:
+    """part1 over two merged runs: pair off their sorted values a block at a time.
+
+    With the buffered runs laid out by rank, the pairs fall into segments between the
+    rank boundaries of either side, and each segment pairs one value with one value.
+    """
+    total = 0
+    while not left.done and not right.done:
+        left_ends = np.cumsum(left.buffer[:, 1])
+        right_ends = np.cumsum(right.buffer[:, 1])
+        bound = min(left_ends[-1], right_ends[-1])
+        ends = np.union1d(
+            left_ends[left_ends <= bound], right_ends[right_ends <= bound]
+        )
+        starts = np.concatenate([[0], ends[:-1]])
+        left_at = np.searchsorted(left_ends, starts, side="right")
+        right_at = np.searchsorted(right_ends, starts, side="right")
+        gaps = np.abs(left.buffer[left_at, 0] - right.buffer[right_at, 0])
+        total += int(((ends - starts) * gaps).sum())
+        for reader, reader_ends in ((left, left_ends), (right, right_ends)):
+            used = int(np.searchsorted(reader_ends, bound, side="right"))
+            if used < len(reader.buffer):
+                # the run straddling the bound is only partly paired off
+                reader.buffer[used, 1] = reader_ends[used] - bound
+            reader.drop(used)
+    return total
+
+
+def similarity(left: RunReader, right: RunReader) -> int:
+    """part2 over two merged runs: a merge join on value, a block at a time."""
+    total = 0
+    while not left.done and not right.done:
+        bound = min(int(left.buffer[-1, 0]), int(right.buffer[-1, 0]))
+        left_rows, right_rows = left.take_through(bound), right.take_through(bound)
+        values, li, ri = np.intersect1d(
+            left_rows[:, 0], right_rows[:, 0], assume_unique=True, return_indices=True
+        )
+        # python ints, since value * count * count can overflow int64
+        total += int(
+            (values.astype(object) * left_rows[li, 1] * right_rows[ri, 1]).sum()
+        )
+    return total
+
+
+def solve_external(
+    lines: Iterable[str] | Iterable[bytes],
+    chunk_rows: int = 1_000_000,
+    block_rows: int = 8192,
+    fan_in: int = 16,
+    tmp_dir: str | Path | None = None,
+) -> tuple[int, int]:
+    """Return (part1, part2) for input that may not fit in memory.
+
+    <lines> are read <chunk_rows> at a time, and each chunk's columns are spilled to
+    temporary files as sorted (value, count) runs. The runs are merged <fan_in> at a
+    time, each read <block_rows> rows at a time, until each column is one run. Both
+    parts are then answered by streaming the two runs side by side. Memory is bounded
+    by <chunk_rows> and <fan_in> * <block_rows>, however long the input is.
+    """
+    lines = iter(lines)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as directory:
+        left_paths, right_paths = [], []
+        while chunk := list(islice(lines, chunk_rows)):
+            joiner = "\n" if isinstance(chunk[0], str) else b"\n"
+            left, right = parse_input(joiner.join(chunk))
+            del chunk
+            left_paths.append(Path(directory, f"left{len(left_paths)}.run"))
+            right_paths.append(Path(directory, f"right{len(right_paths)}.run"))
+            write_run(left_paths[-1], left)
+            write_run(right_paths[-1], right)
+        if not left_paths:
+            return 0, 0
+
+        left_path = merge_runs(left_paths, block_rows, fan_in)
+        right_path = merge_runs(right_paths, block_rows, fan_in)
+        distances = distance_sum(
+            RunReader(left_path, block_rows), RunReader(right_path, block_rows)
+        )
+        similarities = similarity(
+            RunReader(left_path, block_rows), RunReader(right_path, block_rows)
+        )
+    return distances, similarities
 
 
 test_input = """
@@ -41,12 +228,22 @@ test_input = """
 3   9
 3   3"""
 
-assert part1(parse_input(test_input)) == 11
-assert part2(parse_input(test_input)) == 31
+example(part1, test_input, 11)
+example(part2, test_input, 31)
+example(
+    solve_external,
+    test_input,
+    (11, 31),
+    parse=str.splitlines,
+    chunk_rows=1,
+    block_rows=2,
+    fan_in=2,
+)
 
 if __name__ == "__main__":
-    with open("inputs/day01.txt") as flines:
-        data = parse_input(flines.read())
+    run_examples(__name__)
+
+    data = load_input("inputs/day01.txt")
 
     print(f"part 1: {part1(data)}")
     print(f"part 2: {part2(data)}")
@@ -7,40 +7,128 @@ A report is safe if:
   - any two adjacent levels differ by at least one and at most three
 """
 
+from dataclasses import dataclass
+from itertools import pairwise
 from pathlib import Path
+from typing import Iterator
 
+import numpy as np
 
-def parse_input(input_str: str) -> list[list[int]]:
-    return [
-        [int(x) for x in line.strip().split()] for line in input_str.split("\n") if line
-    ]
+from tokens import parse_int_lines
+from verify import example, run_examples
 
 
-def is_safe(row: list[int]) -> bool:
-    diff_set = {row[i] - row[i - 1] for i in range(1, len(row))}
-    return diff_set <= {1, 2, 3} or diff_set <= {-1, -2, -3}
+@dataclass
+class Reports:
+    """Every report's levels end to end, CSR style: report i is
+    levels[offsets[i] : offsets[i + 1]]."""
 
+    levels: np.ndarray
+    offsets: np.ndarray
 
-def part1(input_data: list[list[int]]) -> int:
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[list[int]]:
+        levels = self.levels.tolist()
+        for start, end in pairwise(self.offsets.tolist()):
+            yield levels[start:end]
+
+
+def parse_input(input_str: str | bytes) -> Reports:
+    """Pack the reports into one flat array of levels, plus the offsets where each one
+    starts. Blank lines are skipped."""
+    levels, lengths = parse_int_lines(input_str)
+    offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+    return Reports(levels, offsets)
+
+
+def steps_ok(diffs: np.ndarray, sign: int) -> np.ndarray:
+    if sign > 0:
+        return (diffs >= 1) & (diffs <= 3)
+    return (diffs <= -1) & (diffs >= -3)
+
+
+def safe_reports(reports: Reports, tolerance: int = 0) -> np.ndarray:
+    """Whether each report is safe once up to <tolerance> (0 or 1) levels are removed.
+
+    Every report is checked at once. For each direction, a running count of the bad
+    diffs gives the bad diffs before and after any level in its report. Removing level
+    j then works if both counts are zero and levels j - 1 and j + 1 step safely.
+    """
+    if tolerance not in (0, 1):
+        raise ValueError("safe_reports handles a tolerance of 0 or 1")
+    levels, offsets = reports.levels, reports.offsets
+    if not len(reports):
+        return np.zeros(0, dtype=bool)
+    starts, ends = offsets[:-1], offsets[1:]
+    lengths = np.diff(offsets)
+    # diffs[i] = levels[i + 1] - levels[i], which only counts inside a report
+    diffs = np.diff(levels, append=0)
+    within = np.ones(len(levels), dtype=bool)
+    within[ends - 1] = False
+    interior = within.copy()
+    interior[starts] = False
+    # bridged[i] is the step left behind when level i is removed
+    bridged = np.zeros_like(levels)
+    bridged[1:-1] = levels[2:] - levels[:-2]
+
+    safe = np.zeros(len(reports), dtype=bool)
+    for sign in (1, -1):
+        bad = within & ~steps_ok(diffs, sign)
+        bad_before = np.concatenate([[0], np.cumsum(bad)])
+        if tolerance == 0:
+            safe |= bad_before[ends] == bad_before[starts]
+            continue
+        # bad diffs ahead of level i - 1, and after level i + 1
+        before = np.concatenate([[0], bad_before[:-2]])
+        before -= np.repeat(bad_before[starts], lengths)
+        before[starts] = 0
+        after = np.repeat(bad_before[ends], lengths) - bad_before[1:]
+        removable = (before == 0) & (after == 0)
+        removable &= ~interior | steps_ok(bridged, sign)
+        safe |= np.logical_or.reduceat(removable, starts)
+    return safe
+
+
+def part1(input_data: Reports) -> int:
     """
     Count the number of 'safe' levels
     """
-    count = 0
-    for row in input_data:
-        count += is_safe(row)
-    return count
+    return int(safe_reports(input_data).sum())
+
+
+def is_safe_with_removals(row: list[int], k: int = 1) -> bool:
+    """Whether <row> can be made safe by removing at most <k> levels.
+
+    For each direction, removals[i] is the fewest removals leaving a safe report that
+    ends at row[i]. The level kept before row[i] must be one of the k + 1 before it, so
+    this is O(n k) rather than retrying every possible removal.
+    """
+    n = len(row)
+    if n <= k + 1:
+        return True
+    for sign in (1, -1):
+        removals = []
+        for i, level in enumerate(row):
+            fewest = i  # drop everything before it
+            for j in range(max(0, i - k - 1), i):
+                dropped = removals[j] + i - j - 1
+                if dropped < fewest and 1 <= sign * (level - row[j]) <= 3:
+                    fewest = dropped
+            removals.append(fewest)
+        if any(dropped + n - 1 - i <= k for i, dropped in enumerate(removals)):
+            return True
+    return False
 
 
-def part2(input_data: list[list[int]]) -> int:
+def part2(input_data: Reports, tolerance: int = 1) -> int:
     """
-    Count the number of 'safe' levels, where now if removing a single level makes it safe, then its safe.
+    Count the number of 'safe' levels, where now if removing up to <tolerance> levels makes it safe, then its safe.
     """
-    count = 0
-    for row in input_data:
-        count += is_safe(row) or any(
-            is_safe(row[:i] + row[i + 1 :]) for i in range(len(row))
-        )
-    return count
+    if tolerance > 1:
+        return sum(is_safe_with_removals(row, tolerance) for row in input_data)
+    return int(safe_reports(input_data, tolerance).sum())
 
 
 test_input = """7 6 4 2 1
@@ -51,10 +139,14 @@ test_input = """7 6 4 2 1
 1 3 6 7 9
 """
 
-assert part1(parse_input(test_input)) == 2
-assert part2(parse_input(test_input)) == 4
+example(part1, test_input, 2)
+example(part2, test_input, 4)
+example(part2, test_input, 2, tolerance=0)
+example(part2, test_input, 6, tolerance=2)
 
 if __name__ == "__main__":
+    run_examples(__name__)
+
     with Path("inputs/day02.txt").open() as flines:
         data = parse_input(flines.read())
 
@@ -5,12 +5,17 @@ Scan a text string for instructions matching mul(left, right), and sum them.
 Part two: include conditional do() and don't() statements
 """
 
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
 from operator import mul
 
 from enum import Enum
 
+from verify import example, run_examples
+
 
 class InstructionType(Enum):
     MUL = "mul"
@@ -27,48 +32,45 @@ class Instruction:
 
     @property
     def pattern(self) -> str:
-        match self.type:
-            case InstructionType.MUL:
-                return r"mul\(\d+,\d+\)"
-            case InstructionType.DO:
-                return r"do\(\)"
-            case InstructionType.DONT:
-                return r"don\'t\(\)"
+        return PATTERNS[self.type]
 
 
-def parse_input(input_str: str) -> list[Instruction]:
-    instructions = []
-    cursor = 0
-    length = len(input_str)
-
-    while cursor < length:
-        # Try to match instructions at current cursor position
-        if input_str[cursor:].startswith("mul("):
-            # Find the closing parenthesis
-            end = input_str.find(")", cursor)
-            if end != -1:
-                try:
-                    left, right = map(int, input_str[cursor + 4 : end].split(","))
-                    instructions.append(
-                        Instruction(InstructionType.MUL, cursor, left, right)
-                    )
-                    cursor = end + 1
-                    continue
-                except ValueError:
-                    pass  # Not a valid mul instruction, move on
-
-        elif input_str[cursor:].startswith("do()"):
-            instructions.append(Instruction(InstructionType.DO, cursor))
-            cursor += 4
-            continue
+# What int() accepts: surrounding whitespace (which, unlike \s, excludes \x1c-\x1f),
+# a sign, and decimal digits with single underscores between them.
+SPACE = r"[^\S\x1c-\x1f]*"
+INTEGER = r"[+-]?\d+(?:_\d+)*"
 
-        elif input_str[cursor:].startswith("don't()"):
-            instructions.append(Instruction(InstructionType.DONT, cursor))
-            cursor += 7
-            continue
+PATTERNS = {
+    InstructionType.MUL: (
+        rf"mul\({SPACE}(?P<left>{INTEGER}){SPACE},{SPACE}(?P<right>{INTEGER}){SPACE}\)"
+    ),
+    InstructionType.DO: r"do\(\)",
+    InstructionType.DONT: r"don't\(\)",
+}
 
-        cursor += 1  # Move to next character if no instruction found
+SCANNER = re.compile(
+    "|".join(f"(?P<{type.name}>{pattern})" for type, pattern in PATTERNS.items())
+)
+
+
+def parse_input(input_str: str) -> list[Instruction]:
+    """Find every instruction in one left-to-right pass of SCANNER.
 
+    mul(a,b) matches whenever int() would accept a and b. The exception is numbers past
+    int()'s digit limit, which are skipped as invalid. A rejected mul( can't hide another
+    instruction, because nothing inside the brackets can start one.
+    """
+    instructions = []
+    for match in SCANNER.finditer(input_str):
+        type = InstructionType[match.lastgroup]
+        if type is not InstructionType.MUL:
+            instructions.append(Instruction(type, match.start()))
+            continue
+        try:
+            left, right = int(match["left"]), int(match["right"])
+        except ValueError:
+            continue  # too many digits for int()
+        instructions.append(Instruction(type, match.start(), left, right))
     return instructions
 
 
@@ -96,14 +98,148 @@ def part2(input_data: list[Instruction]) -> int:
     return total
 
 
+# An instruction belongs to the chunk it starts in, so a chunk is scanned a little past
+# its end: at least far enough for don't(), and further while a mul( is still open.
+MIN_LOOKAHEAD = len("don't()")
+INCOMPLETE_MUL = re.compile(r"mul\([\d\s,+_-]*\Z")
+
+
+@dataclass
+class ChunkSummary:
+    """What a stretch of memory contributes to both parts, whatever came before it.
+
+    The toggles are True for do() and False for don't(), or None if there wasn't one.
+    Summaries of neighbouring chunks combine with +, so chunks can be scanned in any
+    order and added up left to right.
+    """
+
+    first_toggle: bool | None = None
+    last_toggle: bool | None = None
+    total: int = 0
+    if_enabled: int = 0  # the enabled muls if muls were enabled at the start
+    if_disabled: int = 0  # ...and if they were disabled
+
+    def enabled(self, start: bool) -> int:
+        return self.if_enabled if start else self.if_disabled
+
+    def __add__(self, other: "ChunkSummary") -> "ChunkSummary":
+        def after_self(start: bool) -> bool:
+            return start if self.last_toggle is None else self.last_toggle
+
+        return ChunkSummary(
+            first_toggle=(
+                self.first_toggle if self.first_toggle is not None else other.first_toggle
+            ),
+            last_toggle=(
+                other.last_toggle if other.last_toggle is not None else self.last_toggle
+            ),
+            total=self.total + other.total,
+            if_enabled=self.if_enabled + other.enabled(after_self(True)),
+            if_disabled=self.if_disabled + other.enabled(after_self(False)),
+        )
+
+    @classmethod
+    def from_instructions(cls, instructions: list[Instruction]) -> "ChunkSummary":
+        summary = cls()
+        state = None  # unknown until the first toggle
+        for inst in instructions:
+            match inst.type:
+                case InstructionType.MUL:
+                    product = mul(inst.left, inst.right)
+                    summary.total += product
+                    if state is None:
+                        summary.if_enabled += product
+                    elif state:
+                        summary.if_enabled += product
+                        summary.if_disabled += product
+                case _:
+                    state = inst.type == InstructionType.DO
+                    if summary.first_toggle is None:
+                        summary.first_toggle = state
+                    summary.last_toggle = state
+        return summary
+
+
+def char_boundary(data: bytes | mmap.mmap, position: int) -> int:
+    """The first position at or after <position> that starts a UTF-8 character."""
+    while position < len(data) and data[position] & 0xC0 == 0x80:
+        position += 1
+    return position
+
+
+def chunk_bounds(data: bytes | mmap.mmap, chunk_size: int) -> list[tuple[int, int]]:
+    starts = sorted(
+        {char_boundary(data, start) for start in range(0, len(data), chunk_size)}
+    )
+    return list(zip(starts, starts[1:] + [len(data)]))
+
+
+def scan_range(data: bytes | mmap.mmap, start: int, end: int) -> ChunkSummary:
+    """Summarise the instructions that start in data[start:end] (UTF-8 bytes)."""
+    owned = data[start:end].decode()
+    lookahead = MIN_LOOKAHEAD
+    while True:
+        stop = char_boundary(data, min(end + lookahead, len(data)))
+        text = owned + data[end:stop].decode()
+        opened = text.rfind("mul(", 0, len(owned) + len("mul(") - 1)
+        if stop == len(data) or opened == -1 or not INCOMPLETE_MUL.match(text, opened):
+            break
+        lookahead *= 2
+    instructions = [
+        inst for inst in parse_input(text) if inst.tape_position < len(owned)
+    ]
+    return ChunkSummary.from_instructions(instructions)
+
+
+def scan_buffer(data: bytes | mmap.mmap, chunk_size: int = 1 << 20) -> ChunkSummary:
+    """Summarise the whole of <data>, a chunk at a time."""
+    return sum(
+        (scan_range(data, start, end) for start, end in chunk_bounds(data, chunk_size)),
+        ChunkSummary(),
+    )
+
+
+def scan_file_range(path: Path, start: int, end: int) -> ChunkSummary:
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return scan_range(data, start, end)
+
+
+def scan_file(
+    path: str | Path, chunk_size: int = 16 << 20, workers: int | None = None
+) -> ChunkSummary:
+    """Summarise the file at <path> without reading it into one string, scanning its
+    chunks in parallel. The answers are .total for part one and .if_enabled for part
+    two."""
+    path = Path(path)
+    if not path.stat().st_size:
+        return ChunkSummary()
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        bounds = chunk_bounds(data, chunk_size)
+    if len(bounds) == 1:
+        return scan_file_range(path, *bounds[0])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        starts, ends = zip(*bounds)
+        summaries = executor.map(scan_file_range, [path] * len(bounds), starts, ends)
+        return sum(summaries, ChunkSummary())
+
+
 test_input = (
     """xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"""
 )
 
-assert (part1_test := part1(parse_input(test_input))) == 161, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 48, part2_test
+example(part1, test_input, 161)
+example(part2, test_input, 48)
+example(
+    scan_buffer,
+    test_input,
+    ChunkSummary(False, True, total=161, if_enabled=48, if_disabled=40),
+    parse=str.encode,
+    chunk_size=5,
+)
 
 if __name__ == "__main__":
+    run_examples(__name__)
+
     with Path("inputs/day03.txt").open() as flines:
         data = parse_input(flines.read())
 
@@ -5,62 +5,221 @@ Part 1: Find occurrences of XMAS in a string (horizontal, vertical, diagonal, ba
 Part 2: Find occurences of MAS, in an X shape
 """
 
-from pathlib import Path
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable
 
+import numpy as np
 
-def parse_input(input_str: str) -> list[str]:
-    return [line.strip() for line in input_str.split("\n") if line]
+from grid import load_grid, parse_grid
+from verify import example, run_examples
 
 
-def get_string(input_data, start_coords, direction, match="XMAS") -> str:
-    """Get the 4 letters starting from <start_coords> and ending with string of length 4"""
-    size = len(match)
-    chars = []
-    i, j = start_coords
-    m, n = len(input_data), len(input_data[0])
-    try:
-        for _ in range(size):
-            if i < 0 or i >= m or j < 0 or j >= n:
-                return False
-            chars.append(input_data[i][j])
-            i, j = i + direction[0], j + direction[1]
-        return "".join(chars) == match
+def parse_input(input_str: str | bytes) -> np.ndarray:
+    return parse_grid(input_str)
 
-    except IndexError:
-        return False
 
+DIRECTIONS = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
 
-def part1(input_data: list[str]) -> int:
+
+def span(size: int, step: int, length: int) -> tuple[int, int]:
+    """The range of starts along an axis of <size> from which <length> cells, <step>
+    apart, stay on the grid."""
+    reach = (length - 1) * step
+    return max(0, -reach), min(size, size - reach)
+
+
+def count_word(grid: np.ndarray, word: str | bytes, directions=DIRECTIONS) -> int:
+    """Count the places <word> appears in <grid>, reading in any of <directions>.
+
+    For each direction, compare a shifted view of the whole grid against each letter of
+    the word in turn. That leaves a boolean array of the starts still matching.
     """
-    For each position in the input data, look if XMAS appears in any of the 8 possible directions.
+    if isinstance(word, str):
+        word = word.encode()
+    m, n = grid.shape
+    count = 0
+    for di, dj in directions:
+        i0, i1 = span(m, di, len(word))
+        j0, j1 = span(n, dj, len(word))
+        if i1 <= i0 or j1 <= j0 or not word:
+            continue
+        matches = np.ones((i1 - i0, j1 - j0), dtype=bool)
+        for k, letter in enumerate(word):
+            matches &= (
+                grid[i0 + k * di : i1 + k * di, j0 + k * dj : j1 + k * dj] == letter
+            )
+        count += int(matches.sum())
+    return count
+
+
+def count_cross(grid: np.ndarray, word: str | bytes = b"MAS") -> int:
+    """Count the places two copies of <word> (of odd length) cross in an X, each of
+    them read forwards or backwards."""
+    if isinstance(word, str):
+        word = word.encode()
+    m, n = grid.shape
+    r = len(word) // 2
+    if len(word) % 2 == 0 or m <= 2 * r or n <= 2 * r:
+        return 0
+
+    def along(direction: int, letters: bytes) -> np.ndarray:
+        """Whether the diagonal through each centre spells <letters>."""
+        matches = np.ones((m - 2 * r, n - 2 * r), dtype=bool)
+        for k, letter in enumerate(letters):
+            j = r + direction * (k - r)
+            matches &= grid[k : m - 2 * r + k, j : n - 2 * r + j] == letter
+        return matches
+
+    crosses = np.ones((m - 2 * r, n - 2 * r), dtype=bool)
+    for direction in (1, -1):
+        crosses &= along(direction, word) | along(direction, word[::-1])
+    return int(crosses.sum())
+
+
+@dataclass
+class WordAutomaton:
+    """An Aho-Corasick automaton over some words and their reverses.
+
+    It is compiled to a dense table of transitions[state, letter] over just the letters
+    in the words (every other byte is letter 0), so a whole array of lines can take a
+    step together. Scanning a line forwards finds both directions along it.
     """
-    directions = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
-    # assert len(directions) == len(set(directions)) == 8
-    m, n = len(input_data), len(input_data[0])
 
-    count = 0
-    for i in range(m):
-        for j in range(n):
-            for direction in directions:
-                count += get_string(input_data, (i, j), direction)
+    words: list[bytes]
+    letters: np.ndarray  # byte -> letter
+    transitions: np.ndarray  # (state, letter) -> state
+    fail: np.ndarray
+    order: np.ndarray  # states in breadth-first order
+    matches: dict[int, dict[int, int]]  # state -> {word index: matches ending there}
 
-    return count
+    @classmethod
+    def build(cls, words: list[bytes]) -> "WordAutomaton":
+        if not all(words):
+            raise ValueError("can't search for an empty word")
+        letters = np.zeros(256, dtype=np.intp)
+        for letter, byte in enumerate(sorted(set(b"".join(words))), 1):
+            letters[byte] = letter
+
+        children: list[dict[int, int]] = [{}]
+        matches: dict[int, dict[int, int]] = {}
+        for index, word in enumerate(words):
+            for pattern in (word, word[::-1]):  # palindromes are found twice
+                state = 0
+                for letter in letters[list(pattern)].tolist():
+                    if letter not in children[state]:
+                        children[state][letter] = len(children)
+                        children.append({})
+                    state = children[state][letter]
+                found = matches.setdefault(state, {})
+                found[index] = found.get(index, 0) + 1
+
+        transitions = np.zeros((len(children), letters.max() + 1), dtype=np.intp)
+        fail = np.zeros(len(children), dtype=np.intp)
+        order = [0]
+        queue = deque(children[0].values())
+        transitions[0, list(children[0])] = list(children[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            transitions[state] = transitions[fail[state]]
+            for letter, child in children[state].items():
+                fail[child] = transitions[fail[state], letter]
+                transitions[state, letter] = child
+                queue.append(child)
+        return cls(words, letters, transitions, fail, np.array(order), matches)
+
+    def step(self, states: np.ndarray, chars: np.ndarray) -> np.ndarray:
+        return self.transitions[states, self.letters[chars]]
+
+    def counts(self, visits: np.ndarray) -> list[int]:
+        """Matches of each word, given how often each state was reached. Reaching a
+        state also completes every match along its chain of failure links."""
+        visits = visits.copy()
+        for state in self.order[:0:-1].tolist():
+            visits[self.fail[state]] += visits[state]
+        counts = [0] * len(self.words)
+        for state, found in self.matches.items():
+            for index, n in found.items():
+                counts[index] += int(visits[state]) * n
+        return counts
 
 
-def part2(input_data: list[str]) -> int:
+def scan_band(automaton: WordAutomaton, band: np.ndarray, overlap: int) -> np.ndarray:
+    """How often each state is reached reading along rows, columns and diagonals, ending
+    in band[overlap:]. The first <overlap> rows are only there for context."""
+    rows, n = band.shape
+    reached = []
+
+    states = np.zeros(rows - overlap, dtype=np.intp)
+    for j in range(n):
+        states = automaton.step(states, band[overlap:, j])
+        reached.append(states)
+
+    columns = np.zeros(n, dtype=np.intp)
+    down_right = np.zeros(n, dtype=np.intp)
+    down_left = np.zeros(n, dtype=np.intp)
+    for i in range(rows):
+        # each diagonal moves one column along per row; new ones start at the edge
+        down_right = np.concatenate([[0], down_right[:-1]])
+        down_left = np.concatenate([down_left[1:], [0]])
+        columns = automaton.step(columns, band[i])
+        down_right = automaton.step(down_right, band[i])
+        down_left = automaton.step(down_left, band[i])
+        if i >= overlap:
+            reached += [columns, down_right, down_left]
+
+    if not reached:
+        return np.zeros(len(automaton.transitions), dtype=np.int64)
+    return np.bincount(np.concatenate(reached), minlength=len(automaton.transitions))
+
+
+def count_words(
+    lines: Iterable[str] | Iterable[bytes],
+    words: list[str],
+    band_rows: int = 1024,
+) -> dict[str, int]:
+    """Count how often each of <words> appears in the grid made of <lines>, in any of
+    the 8 directions, as part1 would.
+
+    The grid is read <band_rows> rows at a time, with the last (longest word - 1) rows
+    of each band carried over so matches across the join are still seen. A match
+    belongs to the band holding its last letter, so nothing is counted twice.
     """
-    Look for two MAS, in the shape of an X. (MAS can be forward or backward)
+    encoded = [word.encode() if isinstance(word, str) else word for word in words]
+    automaton = WordAutomaton.build(encoded)
+    context = max(map(len, encoded)) - 1
+    visits = np.zeros(len(automaton.transitions), dtype=np.int64)
+
+    rows = (
+        line.rstrip("\r\n").encode() if isinstance(line, str) else line.rstrip(b"\r\n")
+        for line in lines
+    )
+    rows = (row for row in rows if row)
+    carried = []
+    while band := list(islice(rows, band_rows)):
+        grid = np.frombuffer(b"".join(carried + band), dtype=np.uint8)
+        if len(grid) != len(band[0]) * (len(carried) + len(band)):
+            raise ValueError("grid rows are not all the same length")
+        grid = grid.reshape(len(carried) + len(band), len(band[0]))
+        visits += scan_band(automaton, grid, len(carried))
+        carried = (carried + band)[-context:] if context else []
+    return dict(zip(words, automaton.counts(visits)))
+
+
+def part1(input_data: np.ndarray) -> int:
     """
-    m, n = len(input_data), len(input_data[0])
-    count = 0
-    for i in range(1, m - 1):
-        for j in range(1, n - 1):
-            patch = [row[j - 1 : j + 2] for row in input_data[i - 1 : i + 2]]
-            patch_diag_1 = "".join(patch[i][i] for i in range(3))
-            patch_diag_2 = "".join(patch[i][2 - i] for i in range(3))
-            count += patch_diag_1 in {"SAM", "MAS"} and patch_diag_2 in {"SAM", "MAS"}
+    For each position in the input data, look if XMAS appears in any of the 8 possible directions.
+    """
+    return count_word(input_data, "XMAS")
 
-    return count
+
+def part2(input_data: np.ndarray) -> int:
+    """
+    Look for two MAS, in the shape of an X. (MAS can be forward or backward)
+    """
+    return count_cross(input_data, "MAS")
 
 
 test_input = """MMMSXXMASM
@@ -75,12 +234,23 @@ MAMMMXMMMM
 MXMXAXMASX
 """
 
-assert (part1_test := part1(parse_input(test_input))) == 18, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 9, part2_test
+example(part1, test_input, 18)
+example(part2, test_input, 9)
+example(part1, test_input.encode(), 18)  # bytes are viewed in place, as load_grid does
+example(count_word, test_input, 2, word="SAMX", directions=[(0, 1)])
+example(
+    count_words,
+    test_input,
+    {"XMAS": 18, "SAMX": 18, "MAS": 38, "X": 152},
+    parse=str.splitlines,
+    words=["XMAS", "SAMX", "MAS", "X"],
+    band_rows=3,
+)
 
 if __name__ == "__main__":
-    with Path("inputs/day04.txt").open() as flines:
-        data = parse_input(flines.read())
+    run_examples(__name__)
+
+    data = load_grid("inputs/day04.txt")
 
     print(f"part 1: {part1(data)}")
     print(f"part 2: {part2(data)}")
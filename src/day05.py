@@ -5,9 +5,15 @@ Check lists of numbers and a required ordering, and return the middle values of
 all correctly-ordered lists, summed.
 """
 
+import heapq
+from collections import defaultdict
 from dataclasses import dataclass
+from graphlib import CycleError
 from pathlib import Path
 
+import instrument
+from verify import example, run_examples
+
 
 @dataclass
 class Ordering:
@@ -32,54 +38,91 @@ def parse_input(input_str: str) -> tuple[list[Ordering], list[list[int]]]:
     return orderings, pages
 
 
-def is_valid(page_row: list[int], orderings: list[Ordering]):
-    """Suboptimal perf to start - check each ordering against the list"""
-    page_set = set(page_row)
+def successor_index(orderings: list[Ordering]) -> dict[int, set[int]]:
+    """Map each page to the pages that must come after it."""
+    successors = defaultdict(set)
     for ordering in orderings:
-        if ordering.left in page_set and ordering.right in page_set:
-            if page_row.index(ordering.left) > page_row.index(ordering.right):
-                return False
+        successors[ordering.left].add(ordering.right)
+    return successors
+
+
+def is_valid(page_row: list[int], successors: dict[int, set[int]]) -> bool:
+    """A row is bad if any page has to come after one already seen. That is O(L^2) at
+    worst, however many rules there are."""
+    seen = set()
+    for page in page_row:
+        if page in successors and not successors[page].isdisjoint(seen):
+            return False
+        seen.add(page)
     return True
 
 
 def part1(input_data: tuple[list[Ordering], list[list[int]]]) -> int:
     """Check all rows against the required orderings. For all good rows, sum the middle row value."""
     orderings, page_rows = input_data
+    successors = successor_index(orderings)
 
     valid_row_sum = 0
     for page_row in page_rows:
-        if is_valid(page_row, orderings):
+        if is_valid(page_row, successors):
             valid_row_sum += page_row[len(page_row) // 2]
 
     return valid_row_sum
 
 
-def reorder(page_row: list[int], orderings: list[Ordering]) -> int:
+def reorder(
+    page_row: list[int], successors: dict[int, set[int]]
+) -> tuple[list[int], bool]:
     """
-    Given a bad page_row, work out what orderings apply and reorder <page_row> to be valid accordingly.
+    Given a bad page_row, reorder it to be valid with a topological sort over the rules
+    between its pages: O((L + E) log L) for a row with E applicable rules.
+
+    Whenever several pages are free to go next, the one earliest in <page_row> goes
+    first, so the rules are the only reason a page moves: a row that already satisfies
+    them comes back unchanged. Also returns whether the row was under-constrained, i.e.
+    the rules alone allow more than one order. Rules that form a cycle raise a
+    graphlib.CycleError naming the row.
     """
-    page_set = set(page_row)
-    applicable_orderings = [
-        ordering
-        for ordering in orderings
-        if ordering.left in page_set and ordering.right in page_set
-    ]
-    grouped_orderings = {}
-    for ordering in applicable_orderings:
-        grouped_orderings[ordering.left] = grouped_orderings.get(ordering.left, []) + [
-            ordering.right
-        ]
-    sorted_orderings = sorted(
-        grouped_orderings.items(), key=lambda x: len(x[1]), reverse=True
-    )
+    position = {page: i for i, page in enumerate(page_row)}
+    afters = {page: successors.get(page, set()) & position.keys() for page in position}
+    waiting_on = dict.fromkeys(position, 0)
+    for pages in afters.values():
+        for page in pages:
+            waiting_on[page] += 1
+
+    ready = [(i, page) for page, i in position.items() if not waiting_on[page]]
+    heapq.heapify(ready)
     reordered = []
-    for val, _ in sorted_orderings:
-        reordered.append(val)
-        page_set.remove(val)
-
-    assert len(page_set) == 1, page_set
-    reordered.append(page_set.pop())
-    return reordered
+    underconstrained = False
+    while ready:
+        underconstrained |= len(ready) > 1
+        _, page = heapq.heappop(ready)
+        reordered.append(page)
+        for after in afters[page]:
+            waiting_on[after] -= 1
+            if not waiting_on[after]:
+                heapq.heappush(ready, (position[after], after))
+
+    if len(reordered) < len(position):
+        stuck = [page for page in position if waiting_on[page]]
+        raise CycleError(f"the rules for row {page_row} form a cycle", stuck)
+    instrument.count("day05.reorder.underconstrained", underconstrained)
+    return reordered, underconstrained
+
+
+def reorder_rows(
+    page_rows: list[list[int]], successors: dict[int, set[int]]
+) -> tuple[list[list[int]], list[int]]:
+    """Reorder a batch of rows against the same rules. Also returns the indices of the
+    rows whose new order the rules didn't fully determine."""
+    instrument.count("day05.reorder.rows", len(page_rows))
+    reordered_rows, underconstrained = [], []
+    for i, page_row in enumerate(page_rows):
+        reordered, ambiguous = reorder(page_row, successors)
+        reordered_rows.append(reordered)
+        if ambiguous:
+            underconstrained.append(i)
+    return reordered_rows, underconstrained
 
 
 def part2(input_data: tuple[list[Ordering], list[list[int]]]) -> int:
@@ -88,15 +131,11 @@ def part2(input_data: tuple[list[Ordering], list[list[int]]]) -> int:
     Return the sum of the middle row values for the rearranged rows.
     """
     orderings, page_rows = input_data
+    successors = successor_index(orderings)
 
-    invalid_row_sum = 0
-    for page_row in page_rows:
-        if not is_valid(page_row, orderings):
-            rearranged_page_row = reorder(page_row, orderings)
-
-            invalid_row_sum += rearranged_page_row[len(rearranged_page_row) // 2]
-
-    return invalid_row_sum
+    invalid_rows = [row for row in page_rows if not is_valid(row, successors)]
+    reordered_rows, _ = reorder_rows(invalid_rows, successors)
+    return sum(row[len(row) // 2] for row in reordered_rows)
 
 
 test_input = """47|53
@@ -129,10 +168,14 @@ test_input = """47|53
 97,13,75,29,47
 """
 
-assert (part1_test := part1(parse_input(test_input))) == 143, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 123, part2_test
+example(part1, test_input, 143)
+example(part2, test_input, 123)
+example(part2, "47|53\n97|13\n\n13,53,47,97\n", 97)  # under-constrained
+example(part2, "1|2\n3|4\n\n2,1,3,4,5\n", 3)  # only 1 and 2 swap
 
 if __name__ == "__main__":
+    run_examples(__name__)
+
     with Path("inputs/day05.txt").open() as flines:
         data = parse_input(flines.read())
 
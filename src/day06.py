@@ -6,133 +6,251 @@ then turns right 90 on obstruction, then forwards, etc, either finding a cycle o
 out the distinct positions visited by the guard.
 """
 
-from itertools import cycle
-import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from pathlib import Path
 
+import numpy as np
+
+from grid import VisitedStates, parse_grid
+import instrument
+from verify import example, run_examples
+
 
-direction_list = [(0, -1), (1, 0), (0, 1), (-1, 0)]
-directions = cycle(direction_list)
+# Directions in the order the guard turns through them, as (dx, dy) steps.
+UP, RIGHT, DOWN, LEFT = range(4)
+STEPS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+EXIT = -1
 
+# Candidate obstructions per task when part2 runs on a process pool
+CHUNK_CANDIDATES = 256
 
-def parse_input(input_str: str) -> tuple[np.array, tuple[int, int]]:
+
+def parse_input(input_str: str | bytes) -> tuple[np.array, tuple[int, int]]:
     """Return a 2d numpy array where element is True if theres an obstruction, along
     with the guards position."""
-    # i'm sure you can do this casting more efficiently
-    guard_map = np.array([list(line) for line in input_str.split("\n") if line])
-    guard_position_ys, guard_position_xs = np.where(guard_map == "^")
+    guard_map = parse_grid(input_str)
+    guard_position_ys, guard_position_xs = np.where(guard_map == ord("^"))
     assert len(guard_position_xs) == len(guard_position_ys) == 1
     guard_position = (int(guard_position_xs[0]), int(guard_position_ys[0]))
-    obstacles = guard_map == "#"
+    obstacles = guard_map == ord("#")
     return obstacles.T, guard_position
 
 
-def get_guard_positions(obstacles, guard_position) -> set:
-    visited_coords_and_dir = set()
-    visited_coords = set()
-    guard_direction = next(directions)
-    visited_coords.add(guard_position)
-    visited_coords_and_dir.add((guard_position, guard_direction))
-
-    # keep looping until we see the same coords and direction, or fall off the map.
+def jump_table(obstacles: np.ndarray) -> np.ndarray:
+    """stops[direction, x, y] is where a guard at (x, y) heading in <direction> stops in
+    front of the next obstacle: a y for UP and DOWN, an x for LEFT and RIGHT. It is
+    EXIT if the guard walks off the map instead."""
     m, n = obstacles.shape
+    stops = np.empty((4, m, n), dtype=np.int32)
+    for axis, size, backwards, forwards in ((1, n, UP, DOWN), (0, m, LEFT, RIGHT)):
+        index = np.arange(size).reshape((-1, 1) if axis == 0 else (1, -1))
+        # the nearest obstacle at or behind each cell, then at or ahead of it
+        behind = np.maximum.accumulate(np.where(obstacles, index, -1), axis=axis)
+        ahead = np.flip(
+            np.minimum.accumulate(
+                np.flip(np.where(obstacles, index, size), axis), axis=axis
+            ),
+            axis,
+        )
+        # ...and strictly behind or ahead
+        behind = np.delete(np.insert(behind, 0, -1, axis=axis), -1, axis=axis)
+        ahead = np.delete(np.insert(ahead, size, size, axis=axis), 0, axis=axis)
+        stops[backwards] = np.where(behind >= 0, behind + 1, EXIT)
+        stops[forwards] = np.where(ahead < size, ahead - 1, EXIT)
+    return stops
+
+
+def move(position: tuple[int, int], direction: int, stop: int) -> tuple[int, int]:
+    """Where the guard ends up after walking in <direction> to coordinate <stop>."""
+    x, y = position
+    return (x, stop) if direction in (UP, DOWN) else (stop, y)
+
+
+def edge(shape: tuple[int, int], direction: int) -> int:
+    """The last coordinate on the map in <direction>."""
+    m, n = shape
+    return {UP: 0, RIGHT: m - 1, DOWN: n - 1, LEFT: 0}[direction]
+
+
+def next_stop(
+    stops: np.ndarray,
+    position: tuple[int, int],
+    direction: int,
+    blocked: tuple[int, int] | None = None,
+) -> int:
+    """Look up where the guard stops, as for jump_table, allowing for an extra obstacle
+    at <blocked> that isn't in the table."""
+    x, y = position
+    stop = int(stops[direction, x, y])
+    if blocked is None:
+        return stop
+    bx, by = blocked
+    if direction == UP and bx == x and by < y and (stop == EXIT or by >= stop):
+        return by + 1
+    elif direction == RIGHT and by == y and bx > x and (stop == EXIT or bx <= stop):
+        return bx - 1
+    elif direction == DOWN and bx == x and by > y and (stop == EXIT or by <= stop):
+        return by - 1
+    elif direction == LEFT and by == y and bx < x and (stop == EXIT or bx >= stop):
+        return bx + 1
+    return stop
+
+
+def get_guard_positions(
+    obstacles: np.ndarray,
+    guard_position: tuple[int, int],
+    stops: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Walk the guard from obstacle to obstacle until it leaves the map (or loops).
+
+    Return a boolean map of the cells it walks through, and the first time it walks into
+    each of them after the start: rows of the cell's x and y, then the guard's x, y and
+    direction just before it stepped in, in the order the guard got there.
+    """
+    if stops is None:
+        stops = jump_table(obstacles)
+    visited = np.zeros(obstacles.shape, dtype=bool)
+    visited[guard_position] = True
+    first_visits = []
+    turns = VisitedStates(obstacles.shape)
+    direction = UP
     while True:
-        candidate_x, candidate_y = (
-            guard_position[0] + guard_direction[0],
-            guard_position[1] + guard_direction[1],
+        stop = next_stop(stops, guard_position, direction)
+        end = move(
+            guard_position,
+            direction,
+            edge(obstacles.shape, direction) if stop == EXIT else stop,
         )
-        if not (0 <= candidate_x < m and 0 <= candidate_y < n):
+        dx, dy = STEPS[direction]
+        length = abs(end[0] - guard_position[0]) + abs(end[1] - guard_position[1])
+        steps = np.arange(1, length + 1)
+        xs, ys = guard_position[0] + dx * steps, guard_position[1] + dy * steps
+        fresh = ~visited[xs, ys]
+        visited[xs, ys] = True
+        xs, ys = xs[fresh], ys[fresh]
+        first_visits.append(
+            np.stack([xs, ys, xs - dx, ys - dy, np.full_like(xs, direction)], axis=1)
+        )
+        if stop == EXIT:
             break
-        try:
-            if not obstacles[candidate_x, candidate_y]:
-                # step in direction
-                guard_position = (candidate_x, candidate_y)
-            else:
-                guard_direction = next(directions)
-
-            if (guard_position, guard_direction) in visited_coords_and_dir:
-                break
-        except IndexError:
+        guard_position = end
+        if turns.add(guard_position, direction):
             break
-
-        visited_coords.add(guard_position)
-        visited_coords_and_dir.add((guard_position, guard_direction))
-    return visited_coords_and_dir
+        direction = (direction + 1) % 4
+    instrument.count("day06.get_guard_positions.turns", len(turns))
+    return visited, np.concatenate(first_visits)
 
 
-def part1(input_data: list[list[int]]) -> int:
+def part1(input_data: tuple[np.ndarray, tuple[int, int]]) -> int:
     """
     Simulate the movement of the guard, counting all distinct positions.
     """
     obstacles, guard_position = input_data
-    visited_coords_and_dir = get_guard_positions(obstacles, guard_position)
-    return len(set(pos for pos, dir in visited_coords_and_dir))
-
-
-def check_for_loop(obstacles: np.ndarray, guard_position: tuple[int, int]) -> bool:
+    visited, _ = get_guard_positions(obstacles, guard_position)
+    return int(visited.sum())
+
+
+def check_for_loop(
+    obstacles: np.ndarray,
+    guard_position: tuple[int, int],
+    stops: np.ndarray | None = None,
+    direction: int = UP,
+    blocked: tuple[int, int] | None = None,
+    turns: VisitedStates | None = None,
+) -> bool:
     """
     Run guard simulation and check if it enters a loop.
     Returns True if a loop is detected, False if guard exits map.
-    """
-    visited_coords_and_dir = set()
-    guard_direction = next(directions)
-    visited_coords_and_dir.add((guard_position, guard_direction))
 
-    m, n = obstacles.shape
+    The guard sets off from <guard_position> heading in <direction>, with an extra
+    obstacle at <blocked> if given. Only the states where the guard turns are
+    recorded, in <turns> (reset first) if given: a loop has to come back to one of them.
+    """
+    if stops is None:
+        stops = jump_table(obstacles)
+    if turns is None:
+        turns = VisitedStates(obstacles.shape)
+    turns.reset()
     while True:
-        # Check next position
-        candidate_x = guard_position[0] + guard_direction[0]
-        candidate_y = guard_position[1] + guard_direction[1]
-
-        # Exit if we're off the map
-        if not (0 <= candidate_x < m and 0 <= candidate_y < n):
+        stop = next_stop(stops, guard_position, direction, blocked)
+        if stop == EXIT:
+            instrument.count("day06.check_for_loop.turns", len(turns))
             return False
+        guard_position = move(guard_position, direction, stop)
+        if turns.add(guard_position, direction):
+            instrument.count("day06.check_for_loop.turns", len(turns))
+            instrument.count("day06.check_for_loop.loops")
+            return True
+        direction = (direction + 1) % 4
 
-        # If path is clear, move forward
-        if not obstacles[candidate_x, candidate_y]:
-            guard_position = (candidate_x, candidate_y)
-        else:
-            # Turn right
-            guard_direction = next(directions)
 
-        # If we've seen this position and direction before, we're in a loop
-        state = (guard_position, guard_direction)
-        if state in visited_coords_and_dir:
-            return True
+def count_loops(
+    obstacles: np.ndarray, stops: np.ndarray, first_visits: np.ndarray
+) -> int:
+    """Count the candidate obstructions (rows from get_guard_positions) that make the
+    guard loop."""
+    instrument.count("day06.check_for_loop.calls", len(first_visits))
+    turns = VisitedStates(obstacles.shape)
+    loop_count = 0
+    for x, y, guard_x, guard_y, direction in first_visits.tolist():
+        loop_count += check_for_loop(
+            obstacles, (guard_x, guard_y), stops, direction, (x, y), turns
+        )
+    return loop_count
 
-        visited_coords_and_dir.add(state)
 
+# Set up in each worker process by attach_shared_map.
+worker_map = {}
 
-def part2(input_data: tuple[np.ndarray, tuple[int, int]]) -> int:
-    """
-    For each position the guard visits (except starting position),
-    try placing an obstruction there and check if it creates a loop.
-    """
-    original_obstacles, start_position = input_data
 
-    # First get all positions the guard visits without modifications
-    visited_coords_and_dir = get_guard_positions(original_obstacles, start_position)
-    visited_positions = set(pos for pos, _ in visited_coords_and_dir)
+def attach_shared_map(name: str, shape: tuple[int, int]) -> None:
+    shared = shared_memory.SharedMemory(name=name)
+    obstacles = np.ndarray(shape, dtype=bool, buffer=shared.buf)
+    worker_map.update(shared=shared, obstacles=obstacles, stops=jump_table(obstacles))
 
-    # Remove starting position as it's not allowed
-    visited_positions.remove(start_position)
 
-    # Try each position as a new obstacle
-    loop_count = 0
-    for pos in visited_positions:
-        # Create new obstacle map with this position blocked
-        obstacles = original_obstacles.copy()
-        obstacles[pos] = True
+def count_loops_in_worker(first_visits: np.ndarray) -> int:
+    return count_loops(worker_map["obstacles"], worker_map["stops"], first_visits)
 
-        # Reset the directions iterator
-        global directions
-        directions = cycle(direction_list)
 
-        # Check if this creates a loop
-        if check_for_loop(obstacles, start_position):
-            loop_count += 1
+def part2(
+    input_data: tuple[np.ndarray, tuple[int, int]],
+    workers: int = 1,
+    chunk_size: int = CHUNK_CANDIDATES,
+) -> int:
+    """
+    For each position the guard visits (except starting position),
+    try placing an obstruction there and check if it creates a loop.
 
-    return loop_count
+    The guard's route is the same as before until it first reaches the obstruction, so
+    each check starts from just in front of it, heading the way the guard was going.
+    With more than one worker, the map goes into shared memory once and the candidates
+    are split into chunks of <chunk_size> across a process pool. The chunks don't
+    depend on the number of workers.
+    """
+    obstacles, start_position = input_data
+    stops = jump_table(obstacles)
+    _, first_visits = get_guard_positions(obstacles, start_position, stops)
+    if workers <= 1:
+        return count_loops(obstacles, stops, first_visits)
+
+    chunks = [
+        first_visits[start : start + chunk_size]
+        for start in range(0, len(first_visits), chunk_size)
+    ]
+    shared = shared_memory.SharedMemory(create=True, size=obstacles.nbytes)
+    try:
+        np.ndarray(obstacles.shape, dtype=bool, buffer=shared.buf)[:] = obstacles
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=attach_shared_map,
+            initargs=(shared.name, obstacles.shape),
+        ) as executor:
+            return sum(executor.map(count_loops_in_worker, chunks))
+    finally:
+        shared.close()
+        shared.unlink()
 
 
 test_input = """....#.....
@@ -146,12 +264,14 @@ test_input = """....#.....
 #.........
 ......#..."""
 
-assert (part1_test := part1(parse_input(test_input))) == 41, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 6, part2_test
+example(part1, test_input, 41)
+example(part2, test_input, 6)
+example(part2, test_input, 6, workers=2, chunk_size=8)
 
 if __name__ == "__main__":
-    with Path("inputs/day06.txt").open() as flines:
-        data = parse_input(flines.read())
+    run_examples(__name__)
+
+    data = parse_input(Path("inputs/day06.txt").read_bytes())
 
     print(f"part 1: {part1(data)}")
     print(f"part 2: {part2(data)}")
@@ -8,10 +8,12 @@ We only have adds and multiplies, and operators are always evaluated left to rig
 
 from dataclasses import dataclass
 from itertools import product
-from math import log10
 from operator import add, mul
 from pathlib import Path
 
+import instrument
+from verify import example, run_examples
+
 
 @dataclass
 class Equation:
@@ -29,25 +31,99 @@ def parse_input(input_str: str) -> list[Equation]:
     return equations
 
 
+def digits(x: int) -> int:
+    return len(str(x))
+
+
+def concat(x, y):
+    return x * 10 ** digits(y) + y
+
+
+# Marks a branch that works whatever the operands before it make (x * 0 == 0)
+ANY = object()
+
+
+def unadd(target: int, y: int) -> int | None:
+    return target - y if target >= y else None
+
+
+def unmul(target: int, y: int) -> int | None:
+    if y == 0:
+        return ANY if target == 0 else None
+    return target // y if target % y == 0 else None
+
+
+def unconcat(target: int, y: int) -> int | None:
+    shift = 10 ** digits(y)
+    return target // shift if target >= y and target % shift == y else None
+
+
+# For each operator, the inverse giving the left operand x with op(x, y) == target, or
+# None if there isn't one. These assume the operands aren't negative, so nothing
+# evaluated left to right ever is either.
+INVERSES = {add: unadd, mul: unmul, concat: unconcat}
+
+
+def solvable_backwards(equation: Equation, inverses) -> tuple[bool, int]:
+    """Whether some choice of operators makes <equation> work, and how many states
+    were explored finding out.
+
+    Start from the value and undo the operators from the right. A branch is dropped as
+    soon as an operator can't be undone, e.g. a value that doesn't divide or doesn't
+    end in the right digits.
+    """
+    operands = equation.operands
+    stack = [(equation.value, len(operands) - 1)]
+    states = 0
+    while stack:
+        target, i = stack.pop()
+        states += 1
+        if i == 0:
+            if target == operands[0]:
+                return True, states
+            continue
+        for undo in inverses:
+            previous = undo(target, operands[i])
+            if previous is ANY:
+                return True, states
+            if previous is not None:
+                stack.append((previous, i - 1))
+    return False, states
+
+
+def solvable_forwards(equation: Equation, valid_operators) -> tuple[bool, int]:
+    """Try every combination of operators, left to right."""
+    value, operands = equation.value, equation.operands
+    combinations_tried = 0
+    for operators in product(valid_operators, repeat=len(operands) - 1):
+        combinations_tried += 1
+        test_value = operands[0]
+        for op, val in zip(operators, operands[1:]):
+            test_value = op(test_value, val)
+        if test_value == value:
+            return True, combinations_tried
+    return False, combinations_tried
+
+
 def get_valid_values(input_data, valid_operators):
+    """Solve backwards where every operator has an entry in INVERSES and no operand is
+    negative, and fall back to trying every combination otherwise."""
+    backwards = all(op in INVERSES for op in valid_operators)
+    inverses = [INVERSES[op] for op in valid_operators] if backwards else []
     valid_values = []
+    states_explored = 0
     for equation in input_data:
-        value, operands = equation.value, equation.operands
-        for operators in product(valid_operators, repeat=len(operands) - 1):
-            test_value = operands[0]
-            for op, val in zip(operators, operands[1:]):
-                test_value = op(test_value, val)
-            if test_value == value:
-                valid_values.append(value)
-                break
+        if backwards and min(equation.operands) >= 0:
+            solvable, states = solvable_backwards(equation, inverses)
+        else:
+            solvable, states = solvable_forwards(equation, valid_operators)
+        states_explored += states
+        if solvable:
+            valid_values.append(equation.value)
+    instrument.count("day07.get_valid_values.states", states_explored)
     return valid_values
 
 
-def concat(x, y):
-    y_num_digits = int(log10(y)) + 1
-    return x * 10**y_num_digits + y
-
-
 def part1(input_data: list[Equation]) -> int:
     """
     Given a list of equations with missing operands, work out where to put + and *,
@@ -78,10 +154,13 @@ test_input = """190: 10 19
 292: 11 6 16 20
 """
 
-assert (part1_test := part1(parse_input(test_input))) == 3749, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 11387, part2_test
+example(part1, test_input, 3749)
+example(part2, test_input, 11387)
+example(part2, "1068: 1 0 6 8\n0: 5 0\n7: 3 4\n", 1068 + 0 + 7)
 
 if __name__ == "__main__":
+    run_examples(__name__)
+
     with Path("inputs/day07.txt").open() as flines:
         data = parse_input(flines.read())
 
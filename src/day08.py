@@ -10,18 +10,19 @@ Part two: Antinodes occur on every point in a straight line along the two antenn
 from pathlib import Path
 from collections import defaultdict
 
+import numpy as np
 
-def parse_input(input_str: str):
+from grid import parse_grid
+from verify import example, run_examples
+
+
+def parse_input(input_str: str | bytes):
+    antenna_map = parse_grid(input_str)
     antenna_locs: dict[str, tuple[int, int]] = defaultdict(list)
-    for i, line in enumerate(input_str.split("\n")):
-        if line:
-            for j, letter in enumerate(line):
-                if letter != ".":
-                    antenna_locs[letter].append((i, j))
+    for i, j in np.argwhere(antenna_map != ord(".")):
+        antenna_locs[chr(antenna_map[i, j])].append((int(i), int(j)))
 
-    m = len([line for line in input_str.split("\n") if line])
-    n = len(input_str.split("\n")[0])
-    return antenna_locs, (m, n)
+    return antenna_locs, antenna_map.shape
 
 
 def find_antinodes(loc, other_loc, m, n):
@@ -103,12 +104,13 @@ test_input = """............
 ............
 """
 
-assert (part1_test := part1(parse_input(test_input))) == 14, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 34, part2_test
+example(part1, test_input, 14)
+example(part2, test_input, 34)
 
 if __name__ == "__main__":
-    with Path("inputs/day08.txt").open() as flines:
-        data = parse_input(flines.read())
+    run_examples(__name__)
+
+    data = parse_input(Path("inputs/day08.txt").read_bytes())
 
     print(f"part 1: {part1(data)}")
     print(f"part 2: {part2(data)}")
@@ -11,6 +11,8 @@ For part 2, move whole blocks.
 import numpy as np
 from pathlib import Path
 
+from verify import example, run_examples
+
 
 def parse_input(input_str: str) -> np.array:
     """Return a list of occupied and free blocks"""
@@ -71,6 +73,7 @@ def part1(input_data: np.array) -> int:
 
     I actually think its easiest to make the whole disk here.
     """
+    input_data = input_data.copy()
     # move the blocks, very stupidly
     block_tracker = len(input_data) - 1
     free_space = list(np.where(input_data == -1)[0])[::-1]
@@ -90,6 +93,7 @@ def part1(input_data: np.array) -> int:
 
 def part2(input_data: np.array) -> int:
     """As in part 1 but now move whole blocks."""
+    input_data = input_data.copy()
     free_space = np.where(input_data == -1)[0]
     for block_id in range(np.max(input_data), -1, -1):
         block_indices = np.where(input_data == block_id)[0]
@@ -115,12 +119,14 @@ def part2(input_data: np.array) -> int:
 
 test_input = "2333133121414131402"
 
-assert (part1_test := part1(parse_input(test_input))) == 1928, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 2858, part2_test
+example(part1, test_input, 1928)
+example(part2, test_input, 2858)
 
 if __name__ == "__main__":
+    run_examples(__name__)
+
     with Path("inputs/day09.txt").open() as flines:
         data = parse_input(flines.read())
 
-    print(f"part 1: {part1(data.copy())}")
+    print(f"part 1: {part1(data)}")
     print(f"part 2: {part2(data)}")
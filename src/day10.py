@@ -11,25 +11,22 @@ from collections import deque
 import numpy as np
 from pathlib import Path
 
+from grid import parse_grid
+from verify import example, run_examples
 
-def parse_input(input_str: str) -> np.array:
-    return np.array(
-        [[int(x) for x in line] for line in input_str.split("\n") if line], dtype=int
-    )
 
+def parse_input(input_str: str | bytes) -> np.array:
+    """Heights, inside a border of height -2 ("." - "0") that no trail can step onto."""
+    return parse_grid(input_str, pad=".").astype(np.int8) - ord("0")
 
-def get_neighbours(m, n, i, j):
-    neighbours = []
-    for direction in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-        candidate_i, candidate_j = i + direction[0], j + direction[1]
-        if 0 <= candidate_i < m and 0 <= candidate_j < n:
-            neighbours.append((candidate_i, candidate_j))
-    return neighbours
+
+def get_neighbours(i, j):
+    # no bounds checks needed: trails never reach the border, so (i, j) is never on it
+    return [(i, j + 1), (i + 1, j), (i, j - 1), (i - 1, j)]
 
 
 def find_trails(matrix: np.array, start_i: int, start_j: int, visited_track) -> int:
     """Bfs to find trails"""
-    m, n = matrix.shape
     trails = 0
     queue = deque()
     visited = set()
@@ -41,7 +38,7 @@ def find_trails(matrix: np.array, start_i: int, start_j: int, visited_track) ->
         if val == 9:
             trails += 1
             continue
-        for next_i, next_j in get_neighbours(m, n, i, j):
+        for next_i, next_j in get_neighbours(i, j):
             if matrix[next_i, next_j] == val + 1 and (
                 not visited_track or (next_i, next_j) not in visited
             ):
@@ -80,12 +77,13 @@ test_input = """89010123
 10456732
 """
 
-assert (part1_test := part1(parse_input(test_input))) == 36, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 81, part2_test
+example(part1, test_input, 36)
+example(part2, test_input, 81)
 
 if __name__ == "__main__":
-    with Path("inputs/day10.txt").open() as flines:
-        data = parse_input(flines.read())
+    run_examples(__name__)
+
+    data = parse_input(Path("inputs/day10.txt").read_bytes())
 
     print(f"part 1: {part1(data)}")
     print(f"part 2: {part2(data)}")
@@ -13,6 +13,9 @@ import math
 from functools import cache
 from pathlib import Path
 
+import instrument
+from verify import example, run_examples
+
 
 def parse_input(input_str: str) -> list[int]:
     return [int(x.strip()) for x in input_str.split()]
@@ -38,22 +41,29 @@ def analyze_growth(stone: int, steps: int) -> int:
         return analyze_growth(stone * 2024, steps - 1)
 
 
-def part1(input_data: list[int], steps: int) -> int:
+def part1(input_data: list[int], steps: int = 25) -> int:
     """Calculate final stone count analytically"""
     total = 0
     for stone in input_data:
         total += analyze_growth(stone, steps)
+    instrument.record_cache("day11.analyze_growth", analyze_growth)
     return total
 
 
+def part2(input_data: list[int], steps: int = 75) -> int:
+    return part1(input_data, steps)
+
+
 test_input = "125 17"
 
-assert (part1_test := part1(parse_input(test_input), steps=6)) == 22, part1_test
-assert (part1_test := part1(parse_input(test_input), steps=25)) == 55312, part1_test
+example(part1, test_input, 22, steps=6)
+example(part1, test_input, 55312)
 
 if __name__ == "__main__":
+    run_examples(__name__)
+
     with Path("inputs/day11.txt").open() as flines:
         data = parse_input(flines.read())
 
-    print(f"part 1: {part1(data.copy(), 25)}")
-    print(f"part 2: {part1(data, 75)}")
+    print(f"part 1: {part1(data)}")
+    print(f"part 2: {part2(data)}")
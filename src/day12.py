@@ -7,11 +7,13 @@ Given a 2d array of chars, separate the different distint chars into regions, an
 
 from collections import deque
 import numpy as np
-from pathlib import Path
 
+from grid import load_grid, parse_grid
+from verify import example, run_examples
 
-def parse_input(input_str: str) -> np.array:
-    return np.array([list(row) for row in input_str.split("\n") if row])
+
+def parse_input(input_str: str | bytes) -> np.array:
+    return parse_grid(input_str)
 
 
 def get_neighbours(map, index):
@@ -166,12 +168,13 @@ MIIISIJEEE
 MMMISSJEEE
 """
 
-assert (part1_test := part1(parse_input(test_input))) == 1930, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 1206, part2_test
+example(part1, test_input, 1930)
+example(part2, test_input, 1206)
 
 if __name__ == "__main__":
-    with Path("inputs/day12.txt").open() as flines:
-        data = parse_input(flines.read())
+    run_examples(__name__)
+
+    data = load_grid("inputs/day12.txt")
 
     print(f"part 1: {part1(data)}")
     print(f"part 2: {part2(data)}")
@@ -11,6 +11,9 @@ import numpy as np
 from pathlib import Path
 import re
 
+import instrument
+from verify import example, run_examples
+
 
 @dataclass
 class ClawMachine:
@@ -47,7 +50,7 @@ def parse_input(input_str: str) -> list[ClawMachine]:
     return claw_machines
 
 
-def part1(input_data: list[ClawMachine]) -> int:
+def part1_search(input_data: list[ClawMachine]) -> int:
     """For each machine, get the minimum number of tokens required to win. Return the sum over all machines.
 
     (For some machines it will be impossible).
@@ -69,15 +72,18 @@ def part1(input_data: list[ClawMachine]) -> int:
         costs = {(0, 0): 0}
         # Use list of (cost, x, y) tuples, sorted by cost
         queue = [(0, 0, 0)]
+        pops = 0
 
         while queue:
             cost, x, y = queue.pop(0)
+            pops += 1
 
             # Skip if we've found a better path to this position
             if cost > costs[(x, y)]:
                 continue
 
             if (x, y) == machine.prize_coords:
+                instrument.count("day13.min_tokens.queue_pops", pops)
                 return cost
 
             for (dx, dy), button_cost in [
@@ -109,6 +115,7 @@ def part1(input_data: list[ClawMachine]) -> int:
                         insert_pos += 1
                     queue.insert(insert_pos, (new_cost, new_x, new_y))
 
+        instrument.count("day13.min_tokens.queue_pops", pops)
         return float("inf")
 
     total_cost = 0
@@ -148,6 +155,11 @@ def part2(input_data: list[ClawMachine], use_correction=True) -> int:
     return int(total_cost)
 
 
+def part1(input_data: list[ClawMachine]) -> int:
+    """The part 2 solve without the correction term (part1_search is far too slow to run for real)."""
+    return part2(input_data, use_correction=False)
+
+
 test_input = """Button A: X+94, Y+34
 Button B: X+22, Y+67
 Prize: X=8400, Y=5400
@@ -165,12 +177,15 @@ Button B: X+27, Y+71
 Prize: X=18641, Y=10279
 """
 
-assert (part1_test := part1(parse_input(test_input))) == 480, part1_test
-# assert (part2_test := part2(parse_input(test_input))) == 480, part2_test
+example(part1, test_input, 480)
+example(part1_search, test_input, 480)
+# example(part2, test_input, 480)
 
 if __name__ == "__main__":
+    run_examples(__name__)
+
     with Path("inputs/day13.txt").open() as flines:
         data = parse_input(flines.read())
 
-    print(f"part 1: {part2(data, use_correction=False)}")
+    print(f"part 1: {part1(data)}")
     print(f"part 2: {part2(data)}")
@@ -5,6 +5,8 @@ dayxx.py
 
 from pathlib import Path
 
+from verify import example, run_examples
+
 
 def parse_input(input_str: str) -> list[list[int]]:
     pass
@@ -21,10 +23,12 @@ def part2(input_data: list[list[int]]) -> int:
 test_input = """
 """
 
-assert (part1_test := part1(parse_input(test_input))) == 0, part1_test
-assert (part2_test := part2(parse_input(test_input))) == 0, part2_test
+example(part1, test_input, 0)
+example(part2, test_input, 0)
 
 if __name__ == "__main__":
+    run_examples(__name__)
+
     with Path("inputs/dayxx.txt").open() as flines:
         data = parse_input(flines.read())
 
@@ -0,0 +1,112 @@
+"""
+grid.py
+
+Character grids as 2d uint8 numpy arrays, without a python object per cell.
+
+The input bytes are viewed in place through np.frombuffer, with the newline column
+stepped over by the row stride rather than copied out, so a grid costs one byte per cell
+(a '<U1' array costs four) and nothing per character in python. Compare cells against
+byte values, e.g. grid == ord("#").
+"""
+
+import mmap
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+
+
+def parse_grid(
+    data: str | bytes | bytearray | memoryview | mmap.mmap,
+    pad: str | None = None,
+) -> np.ndarray:
+    """View <data> as a read-only (rows, cols) uint8 array.
+
+    Bytes-like data is used without copying; a str is encoded once. Leading and trailing
+    blank lines are ignored, and \\r\\n line endings are fine.
+
+    With <pad>, the grid is wrapped in a one-cell border of that character so that
+    neighbour lookups never need bounds checks. This makes a (writeable) copy.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    buffer = np.frombuffer(data, dtype=np.uint8)
+
+    content = np.flatnonzero((buffer != NEWLINE) & (buffer != CARRIAGE_RETURN))
+    if len(content) == 0:
+        return np.empty((0, 0), dtype=np.uint8)
+    buffer = buffer[content[0] : content[-1] + 1]
+
+    newlines = np.flatnonzero(buffer == NEWLINE)
+    line_length = int(newlines[0]) if len(newlines) else len(buffer)
+    stride = line_length + 1
+    cols = line_length
+    if line_length and buffer[line_length - 1] == CARRIAGE_RETURN:
+        cols -= 1
+    rows = len(newlines) + 1
+
+    expected_newlines = np.arange(1, rows) * stride - 1
+    if len(buffer) != (rows - 1) * stride + cols or not np.array_equal(
+        newlines, expected_newlines
+    ):
+        raise ValueError("grid rows are not all the same length")
+
+    grid = as_strided(buffer, shape=(rows, cols), strides=(stride, 1), writeable=False)
+    if pad is not None:
+        grid = np.pad(grid, 1, constant_values=ord(pad))
+    return grid
+
+
+def load_grid(path: str | Path, pad: str | None = None) -> np.ndarray:
+    """Memory-map the file at <path> and view it as a grid (see parse_grid)."""
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return np.empty((0, 0), dtype=np.uint8)
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return parse_grid(data, pad=pad)
+
+
+class VisitedStates:
+    """The (cell, direction) states a grid walker has been in, as one uint8 per cell
+    with bit d set once it has been there heading in direction d (0-3).
+
+    reset() only clears the cells touched since the last reset, so a single instance
+    can be reused for many short walks over a big grid. Single cells are read and
+    written through a flat memoryview of <bits>, which is much quicker than indexing
+    the array one element at a time.
+    """
+
+    def __init__(self, shape: tuple[int, int]):
+        self.bits = np.zeros(shape, dtype=np.uint8)
+        self.cells = memoryview(self.bits.reshape(-1))
+        self.cols = shape[1]
+        self.touched: list[int] = []
+        self.count = 0
+
+    def add(self, position: tuple[int, int], direction: int) -> bool:
+        """Record a state, returning whether it had already been seen."""
+        cell = position[0] * self.cols + position[1]
+        bit = 1 << direction
+        flags = self.cells[cell]
+        if flags & bit:
+            return True
+        if not flags:
+            self.touched.append(cell)
+        self.cells[cell] = flags | bit
+        self.count += 1
+        return False
+
+    def __contains__(self, state: tuple[tuple[int, int], int]) -> bool:
+        (i, j), direction = state
+        return bool(self.cells[i * self.cols + j] & (1 << direction))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def reset(self) -> None:
+        self.bits.reshape(-1)[self.touched] = 0
+        self.touched.clear()
+        self.count = 0
@@ -0,0 +1,92 @@
+"""
+instrument.py
+
+Opt-in counters, span timers and cache statistics for looking inside the solvers.
+
+Everything is a no-op until enable() is called. Hot loops shouldn't call in here per
+iteration: tally into a local (or use a size you already have, like len(visited)) and
+report it once with count() on the way out.
+
+    python -m aoc run 6 --profile day06.json
+"""
+
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+enabled = False
+
+counters: Counter = Counter()
+spans: dict[str, list[float]] = defaultdict(list)
+caches: dict[str, dict[str, Any]] = {}
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    counters.clear()
+    spans.clear()
+    caches.clear()
+
+
+def count(name: str, n: int = 1) -> None:
+    if enabled:
+        counters[name] += n
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the body of the with block, accumulating under <name>."""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans[name].append(time.perf_counter() - start)
+
+
+def record_cache(name: str, cached: Callable) -> None:
+    """Snapshot the cache_info() of a functools.cache/lru_cache wrapped function."""
+    if not enabled:
+        return
+    info = cached.cache_info()
+    lookups = info.hits + info.misses
+    caches[name] = {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_rate": info.hits / lookups if lookups else None,
+    }
+
+
+def snapshot() -> dict[str, Any]:
+    return {
+        "counters": dict(counters),
+        "spans": {
+            name: {
+                "calls": len(durations),
+                "total_seconds": sum(durations),
+                "max_seconds": max(durations),
+            }
+            for name, durations in spans.items()
+        },
+        "caches": dict(caches),
+    }
+
+
+def dump(path: str | Path) -> None:
+    Path(path).write_text(json.dumps(snapshot(), indent=2))
@@ -0,0 +1,44 @@
+"""
+tokens.py
+
+Lines of whitespace-separated integers, parsed in one go by numpy rather than line by
+line, so inputs with millions of numbers never become millions of python ints.
+"""
+
+import numpy as np
+
+SPACE = ord(" ")
+NEWLINE = ord("\n")
+
+
+def tokens_per_line(data: bytes) -> np.ndarray:
+    """How many whitespace-separated tokens each non-blank line of <data> holds."""
+    chars = np.frombuffer(data, dtype=np.uint8)
+    # a token starts wherever something other than whitespace follows whitespace
+    space = chars <= SPACE
+    starts = np.flatnonzero(~space & np.concatenate([[True], space[:-1]]))
+    newlines = np.flatnonzero(chars == NEWLINE)
+    per_line = np.bincount(np.searchsorted(newlines, starts))
+    return per_line[per_line > 0]
+
+
+def parse_int_lines(data: str | bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Return every integer in <data> as one flat int64 array, along with how many of
+    them each non-blank line holds.
+
+    A token numpy can't read as an integer is an error, rather than cutting the values
+    short and shifting every line after it.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    per_line = tokens_per_line(data)
+    if not len(per_line):
+        # np.fromstring reads whitespace alone as a single 0
+        return np.zeros(0, dtype=np.int64), per_line
+    try:
+        values = np.fromstring(data, dtype=np.int64, sep=" ")
+    except ValueError as e:  # newer numpy raises rather than stopping short
+        raise ValueError("expected only whitespace-separated integers") from e
+    if len(values) != per_line.sum():
+        raise ValueError("expected only whitespace-separated integers")
+    return values, per_line
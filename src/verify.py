@@ -0,0 +1,60 @@
+"""
+verify.py
+
+Opt-in registry of the worked examples from each puzzle description.
+
+Registering an example only records it, so importing a day module no longer pays for
+running its self-tests. Run them with `run_examples(module_name)`, `python src/dayNN.py`,
+or `python -m aoc verify`.
+"""
+
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+@dataclass
+class Example:
+    solver: Callable
+    input_str: str
+    expected: Any
+    parse: Callable | None = None
+    kwargs: dict = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"{self.solver.__module__}.{self.solver.__name__}"
+
+    def run(self) -> Any:
+        parse = self.parse
+        if parse is None:
+            parse = getattr(sys.modules[self.solver.__module__], "parse_input")
+        return self.solver(parse(self.input_str), **self.kwargs)
+
+
+registry: dict[str, list[Example]] = defaultdict(list)
+
+
+def example(
+    solver: Callable,
+    input_str: str,
+    expected: Any,
+    parse: Callable | None = None,
+    **kwargs,
+) -> None:
+    """Register solver(parse(input_str), **kwargs) == expected, where parse defaults to the
+    parse_input of the solver's module."""
+    registry[solver.__module__].append(
+        Example(solver, input_str, expected, parse=parse, kwargs=kwargs)
+    )
+
+
+def run_examples(module_name: str) -> int:
+    """Check every example registered by <module_name>, returning how many ran."""
+    examples = registry.get(module_name, [])
+    for registered in examples:
+        result = registered.run()
+        assert result == registered.expected, (registered.name, result)
+    return len(examples)
+